@@ -0,0 +1,5 @@
+# on the host the sim package provides neopixel, machine and the MicroPython time functions
+try:
+    import sim  # noqa: F401
+except ImportError:
+    pass
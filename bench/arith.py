@@ -0,0 +1,44 @@
+"""
+Cost of the saturating buffer arithmetic (Fire cooling, fades) before and after the in-place lookup tables.
+The "before" functions rebuild the buffer from a list comprehension like the original ByteMap methods.
+"""
+from trickLED import trickLED
+
+from .util import compare
+
+uint8 = trickLED.uint8
+
+
+def sub_rebuild(bm, val):
+    bm.buf = bytearray([uint8(v - val) for v in bm.buf])
+
+
+def mul_rebuild(bm, val):
+    bpi = bm.bpi
+    bm.buf = bytearray([uint8(bm.buf[i] * val[i % bpi]) for i in range(bm.n * bpi)])
+
+
+def check():
+    a = trickLED.ByteMap(300, 3)
+    b = trickLED.ByteMap(300, 3)
+    for i in range(len(a.buf)):
+        a.buf[i] = b.buf[i] = (i * 37) & 255
+    sub_rebuild(a, 15)
+    b.sub(15)
+    assert a.buf == b.buf
+    mul_rebuild(a, (1.5, 0.5, 2))
+    b.mul((1.5, 0.5, 2))
+    assert a.buf == b.buf
+
+
+def run(sizes=(58, 1000, 10000)):
+    check()
+    for n in sizes:
+        heat = trickLED.ByteMap(n, 1)
+        pix = trickLED.ByteMap(n, 3)
+        compare('ByteMap.sub heat', n, lambda: sub_rebuild(heat, 15), lambda: heat.sub(15))
+        compare('ByteMap.mul rgb', n, lambda: mul_rebuild(pix, (1, 0.9, 0.8)), lambda: pix.mul((1, 0.9, 0.8)))
+
+
+if __name__ == '__main__':
+    run()
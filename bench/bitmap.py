@@ -0,0 +1,33 @@
+"""
+Cost of visiting the lit pixels of a BitMap bit by bit versus the word level helpers.
+"""
+from trickLED import trickLED
+
+from .util import compare
+
+
+def run(sizes=(58, 1000)):
+    for n in sizes:
+        lit = trickLED.BitMap(n)
+        lit.randomize(15)
+        lit.scroll(3)
+
+        def count_per_bit():
+            return sum(lit[i] for i in range(n))
+
+        def lit_per_bit():
+            for i in range(n):
+                if lit[i]:
+                    pass
+
+        def lit_iter():
+            for i in lit.iter_bits():
+                pass
+
+        compare('count 15% lit', n, count_per_bit, lit.count)
+        compare('visit lit 15%', n, lit_per_bit, lit_iter)
+        compare('randomize', n, lambda: trickLED.BitMap(n).randomize(15), lit.randomize)
+
+
+if __name__ == '__main__':
+    run()
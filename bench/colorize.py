@@ -0,0 +1,81 @@
+"""
+Cost of a Fire frame before and after the allocation free colorize(). The "before" function is the
+original colorize that grew a new bytearray one pixel at a time and replaced leds.buf with it.
+"""
+from trickLED import bufops, prng, trickLED
+from trickLED.animations32 import Fire
+
+from .util import compare
+
+
+def colorize_append(ani):
+    buf = bytearray()
+    pal = ani._ordered_palette
+    meta = ani.pixel_meta
+    shift = ani.settings.get('palette_shift', 0)
+    zero = bytearray([0, 0, 0])
+    bpi = pal.bpi
+    mb = meta.buf
+    for span in (range(meta._po, meta.n), range(meta._po)):
+        for k in span:
+            m = mb[k]
+            if m:
+                i = (m >> shift) * bpi
+                buf += pal.buf[i:i + bpi]
+            else:
+                buf += zero
+    ani.leds.buf = buf
+
+
+def make_fire(n):
+    prng.seed(1)
+    ani = Fire(trickLED.TrickLED(None, n), hotspots=4, sparking=32)
+    ani.setup()
+    for _ in range(20):
+        ani.frame += 1
+        ani.calc_frame()
+    return ani
+
+
+def check():
+    for translate in (True, False):
+        saved = bufops._TRANSLATE
+        # also check the MicroPython index loop
+        bufops._TRANSLATE = translate and saved
+        try:
+            for n in (58, 101):
+                ani = make_fire(n)
+                ani.pixel_meta.scroll(7)
+                ani.colorize()
+                out = bytes(ani.leds.buf)
+                colorize_append(ani)
+                assert out == ani.leds.buf
+        finally:
+            bufops._TRANSLATE = saved
+
+
+def run(sizes=(58, 2000)):
+    check()
+    for n in sizes:
+        before = make_fire(n)
+        after = make_fire(n)
+        compare('colorize', n, lambda: colorize_append(before), after.colorize)
+        # a whole frame, the original calc_frame with its colorize swapped for the old one
+        calc = Fire.calc_frame
+
+        def frame_before():
+            before.colorize = lambda: colorize_append(before)
+            calc(before)
+
+        compare('fire frame', n, frame_before, after.calc_frame)
+        after.leds.write()
+        saved = bufops._TRANSLATE
+        bufops._TRANSLATE = False
+        try:
+            compare('colorize without translate', n, lambda: colorize_append(before), after.colorize)
+        finally:
+            bufops._TRANSLATE = saved
+
+
+if __name__ == '__main__':
+    run()
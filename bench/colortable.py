@@ -0,0 +1,72 @@
+"""
+Per-pixel cost of color_wheel and fading_color_wheel before and after the color tables. The "before"
+functions are the original float implementations. heat_color is integer only and is not tabled.
+"""
+from trickLED import trickLED, generators
+
+from .util import compare
+
+uint8 = trickLED.uint8
+
+
+def color_wheel_float(hue, val=255):
+    hue = uint8(hue) % 255
+    pa = hue % 85
+    ss = val / 85
+    ci = uint8(ss * pa)
+    cd = uint8(val) - ci
+    if hue < 85:
+        return cd, ci, 0
+    elif hue < 170:
+        return 0, cd, ci
+    else:
+        return ci, 0, cd
+
+
+def fading_float(stripe_size=20):
+    bv = [255 - int(trickLED.sin8(i * 63.75 / (stripe_size - 1)) * 253) for i in range(stripe_size)]
+    hue = 0
+    while True:
+        for i in range(stripe_size):
+            yield color_wheel_float(hue, bv[i])
+        hue = (hue + 10) % 255
+
+
+def check():
+    """ The tables must give exactly the same colors as the float functions. """
+    for val in (0, 1, 100, 200, 255):
+        for hue in range(255):
+            assert trickLED.color_wheel(hue, val) == color_wheel_float(hue, val), (hue, val)
+
+
+def run(sizes=(58, 1000)):
+    check()
+    for n in sizes:
+        out = [None] * n
+
+        def wheel_before():
+            for i in range(n):
+                out[i] = color_wheel_float(i, 200)
+
+        def wheel_after():
+            cw = trickLED.color_wheel
+            for i in range(n):
+                out[i] = cw(i, 200)
+
+        fb = fading_float()
+        fa = generators.fading_color_wheel()
+
+        def fading_before():
+            for i in range(n):
+                out[i] = next(fb)
+
+        def fading_after():
+            for i in range(n):
+                out[i] = next(fa)
+
+        compare('color_wheel', n, wheel_before, wheel_after)
+        compare('fading_color_wheel', n, fading_before, fading_after)
+
+
+if __name__ == '__main__':
+    run()
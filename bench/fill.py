@@ -0,0 +1,48 @@
+"""
+Cost of solid fills before and after the pre-ordered pattern fill.
+The "before" functions set each pixel through __setitem__ like the original fill_solid and ByteMap.fill.
+"""
+from trickLED import trickLED
+
+from .util import compare
+
+
+def fill_solid_per_pixel(leds, color, start_pos=0, end_pos=None):
+    color = trickLED.colval(color, leds.bpp)
+    if end_pos is None or end_pos >= leds.n:
+        end_pos = (leds.repeat_n or leds.n) - 1
+    for i in range(start_pos, end_pos + 1):
+        leds[i] = color
+
+
+def bytemap_fill_per_item(bm, val):
+    val = trickLED.colval(val, bm.bpi)
+    for i in range(bm.n):
+        bm[i] = val
+
+
+def check():
+    a = trickLED.TrickLED(None, 100, repeat_n=40)
+    b = trickLED.TrickLED(None, 100, repeat_n=40)
+    fill_solid_per_pixel(a, 0x102030)
+    b.fill_solid(0x102030)
+    assert a.buf == b.buf
+    fill_solid_per_pixel(a, (1, 2, 3), 5, 17)
+    b.fill_solid((1, 2, 3), 5, 17)
+    assert a.buf == b.buf
+
+
+def run(sizes=(58, 1000, 10000)):
+    check()
+    for n in sizes:
+        leds = trickLED.TrickLED(None, n)
+        half = trickLED.TrickLED(None, n, repeat_n=n // 2)
+        bm = trickLED.ByteMap(n, 3)
+        compare('fill_solid', n, lambda: fill_solid_per_pixel(leds, 0x202020), lambda: leds.fill_solid(0x202020))
+        compare('fill_solid repeat_n=n/2', n, lambda: fill_solid_per_pixel(half, 0x202020),
+                lambda: half.fill_solid(0x202020))
+        compare('ByteMap.fill', n, lambda: bytemap_fill_per_item(bm, 0x202020), lambda: bm.fill(0x202020))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,68 @@
+"""
+Cost of a Fire frame before and after the in-place blur. The "before" function is the original
+calc_frame that copied the heat map every frame and blended it one pixel at a time through the BitMap
+and ByteMap item access.
+"""
+from trickLED import prng, trickLED
+from trickLED.animations32 import Fire
+
+from .util import compare
+
+
+def calc_frame_copy(ani):
+    uint8 = trickLED.uint8
+    mi = ani.calc_n - 1
+    if ani.settings['scroll_speed'] != 0:
+        ani.pixel_meta.scroll(ani.settings['scroll_speed'])
+    for ip, spark in zip(ani._flash_points, prng.rng.randbytes(len(ani._flash_points))):
+        if spark <= ani.settings['sparking']:
+            val = 192 + (spark & 63)
+        else:
+            val = (spark & 127) | 64
+        ani.pixel_meta[ip] = val
+    heat_map = ani.pixel_meta.copy()
+    for i in range(ani.calc_n):
+        if ani._blend_map[i]:
+            if 0 < i < mi:
+                val = (heat_map[i - 1] + heat_map[i] + heat_map[i + 1]) / 3
+            elif i == 0:
+                val = (heat_map[0] + heat_map[1]) / 2
+            else:
+                val = (heat_map[mi - 1] + heat_map[mi]) / 2
+            ani.pixel_meta[i] = uint8(val)
+    ani.pixel_meta.sub(ani.settings.get('cooling'))
+    ani.colorize()
+
+
+def make_fire(n, hotspots):
+    prng.seed(1)
+    ani = Fire(trickLED.TrickLED(None, n), hotspots=hotspots, sparking=64)
+    ani.setup()
+    return ani
+
+
+def check():
+    for n, hotspots in ((58, 1), (58, 4), (300, 9)):
+        a = make_fire(n, hotspots)
+        b = make_fire(n, hotspots)
+        for _ in range(50):
+            prng.seed(a.frame)
+            calc_frame_copy(a)
+            prng.seed(a.frame)
+            b.calc_frame()
+            a.frame += 1
+            assert a.leds.buf == b.leds.buf
+
+
+def run(sizes=(58, 300, 2000)):
+    check()
+    for n in sizes:
+        hotspots = max(n // 60, 1)
+        before = make_fire(n, hotspots)
+        after = make_fire(n, hotspots)
+        compare('fire calc_frame hotspots={}'.format(hotspots), n,
+                lambda: calc_frame_copy(before), after.calc_frame)
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,28 @@
+"""
+Cost of filling a strip from a color generator one next() at a time versus the fill_into() block protocol.
+"""
+from trickLED import trickLED, generators
+
+from .util import compare
+
+
+def fill_per_pixel(leds, gen):
+    for i in range(leds.n):
+        leds[i] = next(gen)
+
+
+def run(sizes=(58, 1000)):
+    specs = (('stepped_color_wheel', {'stripe_size': 7}),
+             ('striped_color_wheel', {}),
+             ('fading_color_wheel', {'stripe_size': 28}),
+             ('random_pastel', {}))
+    for n in sizes:
+        leds = trickLED.TrickLED(None, n)
+        for name, kwargs in specs:
+            ga = getattr(generators, name)(**kwargs)
+            gb = getattr(generators, name)(**kwargs)
+            compare(name, n, lambda: fill_per_pixel(leds, ga), lambda: leds.fill_gen(gb))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,42 @@
+"""
+Per-pixel cost of the fixed point gradient and blend kernels. The "before" functions are the original float
+implementations, tests/test_kernels.py checks that the kernels match them within +/-1 per channel.
+"""
+from trickLED import trickLED
+
+from .util import compare
+
+uint8 = trickLED.uint8
+
+
+def fill_gradient_float(leds, col1, col2, start_pos=0, end_pos=None):
+    if end_pos is None or end_pos >= leds.n:
+        end_pos = (leds.repeat_n or leds.n) - 1
+    steps = end_pos - start_pos
+    col1 = trickLED.colval(col1, leds.bpp)
+    col2 = trickLED.colval(col2, leds.bpp)
+    inc = trickLED.step_inc(col1, col2, steps)
+    for i in range(steps):
+        leds[start_pos + i] = tuple(uint8(col1[n] + inc[n] * i) for n in range(len(col1)))
+    leds[end_pos] = col2
+
+
+def blend_to_color_float(leds, color, pct, start_pos=0, end_pos=None):
+    color = trickLED.colval(color, leds.bpp)
+    if end_pos is None:
+        end_pos = (leds.repeat_n or leds.n) - 1
+    for i in range(start_pos, end_pos + 1):
+        leds[i] = trickLED.blend(leds[i], color, pct)
+
+
+def run(sizes=(58, 1000)):
+    for n in sizes:
+        leds = trickLED.TrickLED(None, n)
+        compare('fill_gradient', n, lambda: fill_gradient_float(leds, (255, 0, 0), (0, 0, 255)),
+                lambda: leds.fill_gradient((255, 0, 0), (0, 0, 255)))
+        compare('blend_to_color', n, lambda: blend_to_color_float(leds, (0, 40, 0), 60),
+                lambda: leds.blend_to_color((0, 40, 0), 60))
+
+
+if __name__ == '__main__':
+    run()
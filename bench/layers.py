@@ -0,0 +1,79 @@
+"""
+Cost of merging layers into the strip with Compositor.compose() for 1 to 4 layers. The "before"
+function blends each layer the way it could be done without the compositor, one pixel at a time with
+trickLED.blend() and the TrickLED item access.
+"""
+import random
+
+from trickLED import bufops, trickLED
+from trickLED.animations import AnimationBase, Compositor
+
+from .util import report, timeit
+
+MODES = (trickLED.BLEND_ALPHA, trickLED.BLEND_ADD, trickLED.BLEND_SCREEN, trickLED.BLEND_MAX)
+
+
+def reference(mode, d, s, op):
+    s2 = s * op // 255
+    if mode == trickLED.BLEND_ADD:
+        return min(d + s2, 255)
+    if mode == trickLED.BLEND_SCREEN:
+        return 255 - (255 - d) * (255 - s2) // 255
+    if mode == trickLED.BLEND_MAX:
+        return max(d, s2)
+    return (s * op + d * (255 - op)) // 255
+
+
+def check():
+    random.seed(1)
+    for mode in MODES:
+        for op in (0, 1, 128, 254, 255):
+            dst = bytearray(random.getrandbits(8) for _ in range(300))
+            src = bytes(random.getrandbits(8) for _ in range(200))
+            exp = bytearray(dst)
+            for i in range(200):
+                exp[50 + i] = reference(mode, dst[50 + i], src[i], op)
+            bufops.blend_into(dst, src, 50, mode, op)
+            # integer rounding of screen may differ by one
+            assert all(abs(a - b) <= 1 for a, b in zip(dst, exp)), (mode, op)
+
+
+def make_compositor(n, layers):
+    random.seed(1)
+    leds = trickLED.TrickLED(None, n)
+    comp = Compositor(leds)
+    for k in range(layers):
+        seg = comp.segment(0, n) if k == 0 else comp.layer(MODES[k % len(MODES)], 160)
+        for i in range(n):
+            seg[i] = (random.getrandbits(8), random.getrandbits(8), random.getrandbits(8))
+        seg.write()
+        comp.add(AnimationBase(seg))
+    return comp
+
+
+def compose_per_pixel(comp):
+    leds = comp.leds
+    segs = [ani.leds for ani in comp.animations]
+    for i in range(leds.n):
+        leds[i] = segs[0][i]
+    for seg in segs[1:]:
+        for i in range(leds.n):
+            leds[i] = trickLED.blend(leds[i], seg[i], 63)
+
+
+def run(sizes=(300, 2000)):
+    check()
+    for n in sizes:
+        for layers in (1, 2, 3, 4):
+            comp = make_compositor(n, layers)
+
+            def compose():
+                comp.animations[-1].leds.changed = True
+                comp.compose()
+
+            report('per pixel blend() {} layers'.format(layers), n, timeit(lambda: compose_per_pixel(comp), 5))
+            report('compose {} layers'.format(layers), n, timeit(compose, 10))
+
+
+if __name__ == '__main__':
+    run()
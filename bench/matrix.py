@@ -0,0 +1,164 @@
+"""
+TrickMatrix drawing and scrolling on 16x16 and 32x32 panels. The "before" functions are the original
+per-pixel versions that computed the serpentine index with a bounds check for every pixel() call. Scrolling
+was not implemented, it is compared with moving every pixel through pixel().
+
+check() also plays the effects on panels of both layouts and checks they send the same frames as a strip of
+the same length, and the 2D Cascade frame is compared with drawing it through pixel().
+"""
+import contextlib
+import io
+
+from trickLED import animations, trickLED
+
+from .util import compare
+
+
+def idx_per_pixel(m, x, y):
+    if x >= m.width or y >= m.height:
+        raise IndexError('Out of bounds error. Dimensions are %d x %d' % (m.width, m.height))
+    if y % 2 == 0 or m.shape == m.LAYOUT_STRAIGHT:
+        return m.width * y + x
+    else:
+        return m.width * (y + 1) - x - 1
+
+
+def fill_rect_per_pixel(m, x, y, width, height, color):
+    for iy in range(y, y + height):
+        for ix in range(x, x + width):
+            m[idx_per_pixel(m, ix, iy)] = color.to_bytes(m.bpp, 'big')
+
+
+def hscroll_per_pixel(m, step):
+    for y in range(m.height):
+        row = [m[idx_per_pixel(m, x, y)] for x in range(m.width)]
+        for x in range(m.width):
+            m[idx_per_pixel(m, (x + step) % m.width, y)] = row[x]
+
+
+def vscroll_per_pixel(m, step):
+    cols = [[m[idx_per_pixel(m, x, y)] for y in range(m.height)] for x in range(m.width)]
+    for x in range(m.width):
+        for y in range(m.height):
+            m[idx_per_pixel(m, x, (y + step) % m.height)] = cols[x][y]
+
+
+def pattern(m):
+    for i in range(m.n):
+        m[i] = (i & 255, (i * 7) & 255, (i * 13) & 255)
+
+
+def blit_per_pixel(m, src, y=0):
+    w = m.width
+    bpp = m.bpp
+    for i in range(len(src) // (w * bpp)):
+        for x in range(w):
+            j = ((i * w) + x) * bpp
+            k = idx_per_pixel(m, x, y + i) * bpp
+            m.buf[k:k + bpp] = src[j:j + bpp]
+
+
+def cascade_per_pixel(ani):
+    """ Cascade.calc_frame() drawing the panel through pixel() """
+    m = ani.leds
+    w = ani.width
+    for y in range(ani.height - 1, 0, -1):
+        for x in range(w):
+            m.pixel(x, y, trickLED.blend(m.pixel(x, y - 1), (0, 0, 0), ani.settings['fade_percent']))
+    for x in range(w):
+        m.pixel(x, 0, next(ani.generator))
+
+
+def check_effects(sizes=((8, 4), (5, 7))):
+    """ Strip effects send the same frames on a TrickMatrix as on a strip of the same length """
+    import effects
+    from sim.run import make_effect
+    for w, h in sizes:
+        for name in effects.get_effect_names():
+            frames = []
+            for width in (None, w):
+                ani = make_effect(name, w * h, width=width)
+                ani.leds.frames = []
+                for _ in range(40):
+                    ani.frame += 1
+                    ani.calc_frame()
+                    ani.leds.write()
+                frames.append(ani.leds.frames)
+            assert frames[0] == frames[1], (name, w, h)
+
+
+def check():
+    for shape in (trickLED.TrickMatrix.LAYOUT_SNAKE, trickLED.TrickMatrix.LAYOUT_STRAIGHT):
+        for w, h in ((16, 16), (7, 5), (1, 3)):
+            a = trickLED.TrickMatrix(None, w, h, shape)
+            b = trickLED.TrickMatrix(None, w, h, shape)
+            for y in range(h):
+                for x in range(w):
+                    assert a._idx(x, y) == idx_per_pixel(a, x, y)
+            fill_rect_per_pixel(a, 0, 1, w, h - 1, 0x102030)
+            b.fill_rect(0, 1, w, h - 1, 0x102030)
+            assert a.buf == b.buf
+            fill_rect_per_pixel(a, w // 3, h // 2, w - w // 3, 1, 0x405060)
+            b.hline(w // 3, h // 2, w - w // 3, 0x405060)
+            fill_rect_per_pixel(a, w // 2, 0, 1, h, 0x708090)
+            b.vline(w // 2, 0, h, (0x70, 0x80, 0x90))
+            assert a.buf == b.buf
+            pattern(a)
+            pattern(b)
+            for step in (1, -3, w + 2):
+                hscroll_per_pixel(a, step)
+                b.hscroll(step)
+                assert a.buf == b.buf, (shape, w, h, 'hscroll', step)
+            for step in (1, 2, -3, h + 1):
+                vscroll_per_pixel(a, step)
+                b.vscroll(step)
+                assert a.buf == b.buf, (shape, w, h, 'vscroll', step)
+            src = bytes(i & 255 for i in range(w * (h - 1) * a.bpp))
+            blit_per_pixel(a, src, 1)
+            b.blit(src, 1)
+            assert a.buf == b.buf, (shape, w, h, 'blit')
+            # only the calculated rows scroll, write() repeats them
+            for mode in (trickLED.TrickLED.REPEAT_MODE_STRIPE, trickLED.TrickLED.REPEAT_MODE_MIRROR):
+                c = trickLED.TrickMatrix(None, w, h, shape, repeat_n=w * (h // 2), repeat_mode=mode)
+                pattern(c)
+                ref = bytes(c.buf[:c.repeat_n * c.bpp])
+                c.hscroll(1)
+                c.hscroll(-1)
+                c.vscroll(2)
+                c.vscroll(-2)
+                c._normalize()
+                assert c.buf[:c.repeat_n * c.bpp] == ref, (shape, w, h, 'repeat', mode)
+        with contextlib.redirect_stdout(io.StringIO()):
+            a = animations.Cascade(trickLED.TrickMatrix(None, 6, 5, shape))
+            b = animations.Cascade(trickLED.TrickMatrix(None, 6, 5, shape))
+        for ani in (a, b):
+            ani.setup()
+        for _ in range(8):
+            cascade_per_pixel(a)
+            b.calc_frame()
+            assert a.leds.buf == b.leds.buf, (shape, 'cascade')
+    check_effects()
+
+
+def run(sizes=(16, 32)):
+    check()
+    for size in sizes:
+        m = trickLED.TrickMatrix(None, size, size)
+        pattern(m)
+        n = m.n
+        compare('fill_rect {0}x{0}'.format(size), n, lambda: fill_rect_per_pixel(m, 0, 0, size, size, 0x204060),
+                lambda: m.fill_rect(0, 0, size, size, 0x204060))
+        half = size // 2
+        compare('fill_rect {0}x{0} quarter'.format(size), n,
+                lambda: fill_rect_per_pixel(m, 1, 1, half, half, 0x204060),
+                lambda: m.fill_rect(1, 1, half, half, 0x204060))
+        compare('hscroll {0}x{0}'.format(size), n, lambda: hscroll_per_pixel(m, 1), lambda: m.hscroll(1))
+        compare('vscroll {0}x{0}'.format(size), n, lambda: vscroll_per_pixel(m, 1), lambda: m.vscroll(1))
+        with contextlib.redirect_stdout(io.StringIO()):
+            ani = animations.Cascade(m)
+        ani.setup()
+        compare('cascade frame {0}x{0}'.format(size), n, lambda: cascade_per_pixel(ani), ani.calc_frame)
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,57 @@
+"""
+Periodic generators served from the cached period table versus calculating a stripe at a time, and the
+cost of creating a generator when its table is already cached, as when switching effects.
+"""
+from trickLED import trickLED, generators
+
+from .util import compare
+
+SPECS = (('stepped_color_wheel', {'stripe_size': 7}),
+         ('striped_color_wheel', {}),
+         ('fading_color_wheel', {'stripe_size': 28}),
+         ('color_compliment', {'stripe_size': 7}))
+
+
+def make(name, kwargs, cached=True):
+    """ Create a generator, with a zero budget it does not fit the cache and calculates stripes. """
+    budget = generators.periods.budget
+    if not cached:
+        generators.periods.evict(0)
+    gen = getattr(generators, name)(**kwargs)
+    generators.periods.evict(budget)
+    return gen
+
+
+def check():
+    order = trickLED.TrickLED(None, 1).ORDER
+    for name, kwargs in SPECS:
+        a = make(name, kwargs)
+        b = make(name, kwargs, cached=False)
+        assert a._key is not None and b._key is None
+        assert [next(a) for _ in range(600)] == [next(b) for _ in range(600)], name
+        ba = bytearray(3000)
+        bb = bytearray(3000)
+        for offset in range(0, 3000, 375):
+            a.fill_into(ba, offset, 125, order)
+            b.fill_into(bb, offset, 125, order)
+        assert ba == bb, name
+
+
+def run(sizes=(58, 1000)):
+    check()
+    for n in sizes:
+        leds = trickLED.TrickLED(None, n)
+        for name, kwargs in SPECS:
+            ga = make(name, kwargs, cached=False)
+            gb = make(name, kwargs)
+            compare(name + ' fill', n, lambda: leds.fill_gen(ga), lambda: leds.fill_gen(gb))
+    for name, kwargs in SPECS:
+        def switch(cached):
+            gen = make(name, kwargs, cached)
+            leds.fill_gen(gen)
+        compare(name + ' switch', leds.n, lambda: switch(False), lambda: switch(True))
+    print('period cache: {} tables, {} bytes'.format(len(generators.periods), generators.periods.size))
+
+
+if __name__ == '__main__':
+    run()
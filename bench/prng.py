@@ -0,0 +1,97 @@
+"""
+Random colors and sparks drawn in bulk from trickLED.prng versus one random module call per pixel or
+spark, as the generators and Fire did before.
+"""
+import random
+import struct
+
+from trickLED import trickLED, generators, prng
+
+from .util import compare
+
+
+def vivid_per_pixel(buf, count, order):
+    """ The original RandomVivid.fill_into, two randrange calls and a shift table per color """
+    shifts = ((16, 8), (8, 0), (0, 16))
+    for j in range(0, count * 3, 3):
+        s = shifts[random.randrange(0, 3)]
+        prime = random.randrange(1, 255)
+        val = prime << s[0] | (255 - prime) << s[1]
+        buf[j + order[0]] = val >> 16
+        buf[j + order[1]] = (val >> 8) & 255
+        buf[j + order[2]] = val & 255
+
+
+def pastel_per_pixel(buf, count, order):
+    """ The original RandomPastel.fill_into, getrandbits(24) per color """
+    for j in range(0, count * 3, 3):
+        val = random.getrandbits(24)
+        for c in range(3):
+            buf[j + order[c]] = (val >> (16 - c * 8)) & 255
+
+
+def randomize_per_word(bm):
+    """ The original BitMap.randomize(15), three getrandbits(32) per 32 bit word """
+    grb = random.getrandbits
+    for i in range(0, bm.wc * 4, 4):
+        struct.pack_into('I', bm.buf, i, grb(32) & grb(32) & grb(32))
+
+
+def bytes_per_call(buf):
+    for i in range(len(buf)):
+        buf[i] = random.getrandbits(8)
+
+
+def check():
+    # the same seed gives the same numbers
+    a = prng.Xorshift(1234)
+    b = prng.Xorshift(1234)
+    assert a.randbytes(101) == b.randbytes(101)
+    # fill draws the same stream as next16, low byte first
+    a.seed(99)
+    b.seed(99)
+    buf = a.randbytes(64)
+    for i in range(0, 64, 2):
+        v = b.next16()
+        assert buf[i] == v & 255 and buf[i + 1] == v >> 8
+    # bounded values stay in range and reach both ends
+    for n in (1, 3, 254, 1000, 70000):
+        seen = set(a.below(n) for _ in range(20000))
+        assert min(seen) == 0 and max(seen) == n - 1 or n > 20000 and max(seen) < n
+    assert all(0 <= a.getrandbits(20) < 1 << 20 for _ in range(1000))
+    # vivid colors have one channel off and the other two adding to 255
+    gen = generators.random_vivid()
+    buf = bytearray(300)
+    gen.fill_into(buf, 0, 100, (1, 0, 2))
+    for j in range(0, 300, 3):
+        px = sorted(buf[j:j + 3])
+        assert px[0] == 0 and px[1] + px[2] == 255
+    # masked pastel channels
+    gen = generators.random_pastel(mask=(255, 0, 63))
+    gen.fill_into(buf, 0, 100, (1, 0, 2))
+    assert max(buf[0::3]) == 0 and max(buf[2::3]) <= 63
+    # BitMap.randomize hits roughly the requested share of ones
+    bm = trickLED.BitMap(3200)
+    for pct in (10, 50, 90):
+        bm.randomize(pct)
+        assert abs(bm.count() / 32 - pct) < 10, (pct, bm.count())
+
+
+def run(sizes=(58, 1000)):
+    check()
+    order = (1, 0, 2)
+    for n in sizes:
+        buf = bytearray(n * 3)
+        vivid = generators.random_vivid()
+        pastel = generators.random_pastel()
+        compare('random_vivid fill', n, lambda: vivid_per_pixel(buf, n, order),
+                lambda: vivid.fill_into(buf, 0, n, order))
+        compare('random_pastel fill', n, lambda: pastel_per_pixel(buf, n, order),
+                lambda: pastel.fill_into(buf, 0, n, order))
+        compare('random bytes', n, lambda: bytes_per_call(buf), lambda: prng.rng.fill(buf))
+        bm = trickLED.BitMap(n)
+        compare('BitMap.randomize', n, lambda: randomize_per_word(bm), lambda: bm.randomize(15))
+
+
+if __name__ == '__main__':
+    run()
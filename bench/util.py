@@ -0,0 +1,28 @@
+"""
+Timing helpers shared by the benchmark scripts. They use the MicroPython ticks functions so the same
+scripts run on the board and on the host.
+"""
+import time
+
+
+def timeit(fn, reps=30):
+    """ Return the average number of microseconds per call of fn. The first call is not timed. """
+    fn()
+    st = time.ticks_us()
+    for _ in range(reps):
+        fn()
+    return time.ticks_diff(time.ticks_us(), st) / reps
+
+
+def report(name, n, us):
+    """ Print the cost of one frame of n pixels. """
+    print('{:<36} n={:<6d} {:11.1f} us/frame {:8.3f} us/px'.format(name, n, us, us / n))
+
+
+def compare(name, n, before, after):
+    """ Time two implementations of the same frame and print the speedup. """
+    ub = timeit(before)
+    ua = timeit(after)
+    report(name + ' before', n, ub)
+    report(name + ' after', n, ua)
+    print('{:<36} x{:0.2f}'.format(name + ' speedup', ub / ua if ua else 0))
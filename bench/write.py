@@ -0,0 +1,103 @@
+"""
+Cost of write() per repeat mode. The "before" functions replicate the section like the original
+_repeat_stripe (copy of the section per write) and _repeat_mirror (one pixel at a time through
+NeoPixel __getitem__ and __setitem__).
+"""
+from neopixel import NeoPixel
+from trickLED import trickLED
+
+from .util import compare, report, timeit
+
+
+def repeat_stripe_copy(leds, n):
+    loc = jump = n * leds.bpp
+    end = leds.n * leds.bpp
+    section = leds.buf[0:jump]
+    while loc + jump <= end:
+        leds.buf[loc:loc + jump] = section
+        loc += jump
+    if loc < end:
+        leds.buf[loc:end] = section[:(end - loc)]
+
+
+def repeat_mirror_per_pixel(leds, n):
+    rl = n - 1
+    d = -1
+    for i in range(n, leds.n):
+        NeoPixel.__setitem__(leds, i, NeoPixel.__getitem__(leds, rl))
+        if 0 < rl < n:
+            rl += 1 * d
+        elif rl == 0:
+            d = 1
+        else:
+            d = -1
+
+
+def mirror_expected(leds, n):
+    """ Pixel values of a correctly mirrored strip: forward, reversed, forward... """
+    sect = [NeoPixel.__getitem__(leds, i) for i in range(n)]
+    out = []
+    while len(out) < leds.n:
+        out.extend(sect if len(out) // n % 2 == 0 else sect[::-1])
+    return out[:leds.n]
+
+
+def check():
+    for n, rn in ((100, 40), (100, 50), (100, 60), (101, 7), (10, 10), (9, 1), (58, 3)):
+        a = trickLED.TrickLED(None, n, repeat_n=rn)
+        b = trickLED.TrickLED(None, n, repeat_n=rn)
+        for i in range(rn):
+            a[i] = b[i] = (i * 3 % 256, i * 7 % 256, i * 11 % 256)
+        repeat_stripe_copy(a, rn)
+        b._repeat_stripe()
+        assert a.buf == b.buf
+        exp = mirror_expected(b, rn)
+        if n <= rn * 2:
+            # the original only gets past the first reversed copy when it is the last one
+            repeat_mirror_per_pixel(a, rn)
+            b._repeat_mirror()
+            assert a.buf == b.buf
+        b._repeat_mirror()
+        assert [NeoPixel.__getitem__(b, i) for i in range(n)] == exp
+
+
+def run(sizes=(58, 1000, 10000)):
+    check()
+    for n in sizes:
+        rn = max(n // 10, 1)
+        leds = trickLED.TrickLED(None, n, repeat_n=rn)
+        for i in range(rn):
+            leds[i] = (i % 256, 255 - i % 256, 64)
+        short = trickLED.TrickLED(None, n, repeat_n=4)
+        compare('stripe repeat_n=4', n, lambda: repeat_stripe_copy(short, 4), short._repeat_stripe)
+        compare('stripe repeat_n=n/10', n, lambda: repeat_stripe_copy(leds, rn), leds._repeat_stripe)
+        compare('mirror repeat_n=n/10', n, lambda: repeat_mirror_per_pixel(leds, rn), leds._repeat_mirror)
+        for name, mode, r in (('write no repeat', None, None),
+                              ('write stripe', trickLED.TrickLED.REPEAT_MODE_STRIPE, rn),
+                              ('write mirror', trickLED.TrickLED.REPEAT_MODE_MIRROR, rn)):
+            leds.repeat_n = r
+            leds.repeat_mode = mode
+            report(name, n, timeit(lambda: leds.write(True)))
+        leds.set_correction(brightness=128, gamma=2.2)
+        report('write mirror with correction', n, timeit(lambda: leds.write(True)))
+
+        def two_pixels():
+            leds[1] = (1, 2, 3)
+            leds[rn - 2] = (3, 2, 1)
+
+        def two_pixels_full():
+            two_pixels()
+            leds.mark_dirty()
+            leds.write()
+
+        def two_pixels_range():
+            two_pixels()
+            leds.write()
+
+        # Convergent and Divergent change a couple of pixels per frame
+        compare('write 2 px changed', n, two_pixels_full, two_pixels_range)
+        leds.set_correction(brightness=255, gamma=1)
+
+
+if __name__ == '__main__':
+    run()
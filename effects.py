@@ -1,4 +1,4 @@
-from trickLED import animations, animations32, generators, trickLED
+from trickLED import animations, animations32, generators, palettes, trickLED
 from random import randint
 import uasyncio as asyncio
 
@@ -42,14 +42,15 @@ class Effects():
         ani.leds.repeat_n = leds.n//2
         return ani
 
-    # Base options: leds, interval=50, palette=None, generator=None, brightness=200
+    # Base options: leds, interval=50, palette=None, generator=None, brightness=255
+    # (strip brightness is trickLED.global_setings['brightness'], change it with leds.set_correction())
     def ani_lit_bits(leds, colors):
-        ani = animations.LitBits(leds, palette = None)
+        ani = animations.LitBits(leds, palette = get_palette(colors, 32))
         # base settings
         ani.leds.repeat_mode = leds.REPEAT_MODE_MIRROR
         ani.leds.repeat_n = leds.n//2
 #         ani.palette = None # color palette
-        ani.generator = getattr(Effects, colors['generator'])(color) # color generator
+        ani.generator = getattr(Effects, colors['generator'])(colors) # color generator
         ani.settings['interval'] = 100 # millisecond pause between each frame
         # anim specific settings
         ani.settings['lit_percent'] = None
@@ -101,7 +102,7 @@ class Effects():
         return ani
     
     def ani_divergent(leds, colors):
-        ani = animations.Divergent(leds, palette = None)
+        ani = animations.Divergent(leds, palette = get_palette(colors, 16))
         # base settings
         ani.leds.repeat_mode = leds.REPEAT_MODE_MIRROR
         ani.leds.repeat_n = leds.n//2
@@ -114,9 +115,9 @@ class Effects():
         return ani
     
     def ani_convergent(leds, colors):
-        ani = animations.Convergent(leds, palette = None)
+        ani = animations.Convergent(leds, palette = get_palette(colors, 16))
         # base settings
-        ani.leds.repeat_n = n//2
+        ani.leds.repeat_n = leds.n//2
         ani.leds.repeat_mode = leds.REPEAT_MODE_MIRROR
 #         ani.palette = None # color palette
         ani.generator = getattr(Effects, colors['generator'])(colors) # color generator
@@ -127,7 +128,7 @@ class Effects():
         return ani
     
     def ani_fire(leds, colors):
-        ani = animations32.Fire(leds, palette = None)
+        ani = animations32.Fire(leds, palette = get_palette(colors))
         # base settings
         ani.leds.repeat_mode = None
         ani.leds.repeat_n = None
@@ -169,12 +170,25 @@ def get_generator_names():
     """
     return [name for name in dir(Effects) if name.startswith('gen_')]
 
-def get_palette():
+def get_palette_names():
+    """
+    @return str the gradient palettes that can be selected in the colors profile
+    """
+    return ['none'] + palettes.names()
+
+def get_palette(colors, n=256):
     """
-    #TODO
-    @return palette get a color palette for animations
+    @return ByteMap the palette selected in the colors profile expanded to n colors,
+            None to let the animation use its default palette
     """
-    pass
+    name = colors.get("palette")
+    if not name or name == 'none':
+        return None
+    try:
+        return palettes.get(name, n)
+    except ValueError:
+        print(f"No palette with name '{name}'.")
+        return None
 
 def get_effect(leds, colors):
     """
@@ -183,5 +197,6 @@ def get_effect(leds, colors):
     try:
         func = getattr(Effects, colors["effect"])
     except:
-        print(f"No effect with name '{effect}' in function name space.")
+        print(f"No effect with name '{colors.get('effect')}' in function name space.")
+        func = Effects.ani_solid_color
     return func(leds, colors)
\ No newline at end of file
@@ -1,12 +1,9 @@
 import time
 from . import trickLED
 from . import generators
-from random import getrandbits
-
-try:
-    from random import randrange
-except ImportError:
-    randrange = trickLED.randrange
+from . import framestats
+from . import bufops
+from . import prng
 
 try:
     import uasyncio as asyncio
@@ -14,9 +11,9 @@ except ImportError:
     import asyncio
 
 
-def default_palette(n, brightness=200):
-    """ Generate a color palette by stepping through the color wheel """
-    rn = getrandbits(8)
+def default_palette(n, brightness=255, rng=None):
+    """ Generate a color palette by stepping through the color wheel from a random hue """
+    rn = (rng or prng.rng).getrandbits(8)
     pal = trickLED.ByteMap(n, 3)
     sa = min(255 // n, 30)
     for i in range(n):
@@ -27,13 +24,17 @@ def default_palette(n, brightness=200):
 class AnimationBase:
     """ Animation base class. """
 
-    def __init__(self, leds, color=None, generator=None, palette=None, interval=50, brightness=200, **kwargs):
+    def __init__(self, leds, color=None, generator=None, palette=None, interval=50, brightness=255, rng=None,
+                 **kwargs):
         """
         :param leds: TrickLED object
         :param interval: millisecond pause between each frame
         :param palette: color palette
         :param generator: color generator
-        :param brightness: set brightness 0-255
+        :param brightness: set brightness 0-255 of the colors the animation creates, dim the whole strip
+                           with TrickLED.set_correction() instead
+        :param rng: prng.Xorshift the animation draws random numbers from, seed it to get the same frames
+                    every run. Defaults to the shared prng.rng
         :param kwargs: additional keywords will be saved to self.settings
         """
         if not isinstance(leds, trickLED.TrickLED):
@@ -42,11 +43,17 @@ class AnimationBase:
         self.frame = 0
         self.palette = palette
         self.generator = generator
+        self.rng = rng or prng.rng
         # configuration values can also be set as keyword arguments to __init__ or run
         self.settings = {'interval': int(interval), 'stripe_size': int(1),
                          'scroll_speed': int(1), 'brightness': trickLED.uint8(brightness)}
         # stores run time information needed for the animation
         self.state = {}
+        # per-frame timings, see enable_stats()
+        self.stats = None
+        # frames dropped by play() to keep up with the interval, and how late the last frame started
+        self.skipped_frames = 0
+        self.late_us = 0
         # number of pixels to calculate before copying from buffer
         if self.leds.repeat_n:
             self.calc_n = self.leds.repeat_n
@@ -92,31 +99,83 @@ class AnimationBase:
         """ Called before rendering each frame """
         pass
 
+    def enable_stats(self, size=128):
+        """
+        Record the timings of the last size frames. Read them with self.stats.summary() while the
+        animation plays. Use size=0 to turn recording off again.
+        """
+        self.stats = framestats.FrameStats(size) if size else None
+        return self.stats
+
     async def play(self, max_iterations=0, **kwargs):
         """
-        Plays animation
+        Plays animation. Frames are scheduled against absolute deadlines interval ms apart, so the time
+        spent calculating and writing a frame is taken out of the pause. If a frame runs a whole interval
+        or more late the missed frames are dropped instead of rushing to catch up, they are counted in
+        self.skipped_frames. self.late_us is how late the last frame started.
+
         :param max_iterations: Number of frames to render
         :param kwargs: Any keys in the settings dictionary can be set by passing as keyword arguments
         """
         for kw in kwargs:
             self.settings[kw] = kwargs[kw]
-        self.leds.fill((0,0,0))
+        self.leds.clear()
         self.setup()
         self.frame = 0        
+        self.skipped_frames = 0
+        self.late_us = 0
         ival = self.settings['interval']
         self.state['start_ticks'] = time.ticks_ms()
+        deadline = time.ticks_us()
         try:
             while max_iterations == 0 or self.frame < max_iterations:
 #                 print("iter ", self.frame)
                 self.frame += 1
-                self.calc_frame()
-                self.leds.write()
-                await asyncio.sleep_ms(ival)
+                if self.stats is None:
+                    self.calc_frame()
+                    self.leds.write()
+                    deadline = await self._wait(deadline, ival * 1000)
+                else:
+                    deadline = await self._play_frame_stats(deadline, ival * 1000)
             self._print_fps()
         except KeyboardInterrupt:
             self._print_fps()
             return
 
+    async def _wait(self, deadline, ival_us):
+        """ Sleep until the frame after deadline is due and return its deadline """
+        deadline = time.ticks_add(deadline, ival_us)
+        late = time.ticks_diff(time.ticks_us(), deadline)
+        if ival_us > 0 and late >= ival_us:
+            # a whole frame or more behind, drop the missed frames
+            missed = late // ival_us
+            self.skipped_frames += missed
+            if self.stats is not None:
+                self.stats.skipped_frames += missed
+            deadline = time.ticks_add(deadline, missed * ival_us)
+            late -= missed * ival_us
+        # always yield so other tasks (the web server) get to run
+        # round up, a frame must not start before its deadline
+        await asyncio.sleep_ms((-late + 999) // 1000 if late < 0 else 0)
+        self.late_us = time.ticks_diff(time.ticks_us(), deadline)
+        return deadline
+
+    async def _play_frame_stats(self, deadline, ival_us):
+        """ Play one frame while recording how long each step took """
+        mem_alloc = framestats.mem_alloc
+        ma = mem_alloc() if mem_alloc else 0
+        t0 = time.ticks_us()
+        self.calc_frame()
+        t1 = time.ticks_us()
+        if not self.leds.write():
+            self.stats.skipped_writes += 1
+        t2 = time.ticks_us()
+        alloc = mem_alloc() - ma if mem_alloc else 0
+        deadline = await self._wait(deadline, ival_us)
+        # a collection during the frame shrinks the heap, count that frame as allocation free
+        self.stats.record(time.ticks_diff(t1, t0), time.ticks_diff(t2, t1), self.late_us, alloc if alloc > 0 else 0)
+        return deadline
+
     def _print_fps(self):
         st = self.state.get('start_ticks')
         if st is None:
@@ -127,6 +186,155 @@ class AnimationBase:
         ifps = 1000 / ival if ival > 0 else 1000
         print('Actual fps: {:0.02f} - interval fps: {:0.02f}\n'.format(fps, ifps))
 
+
+class Compositor:
+    """
+    Play several animations on one strip from a single task. Each animation draws into a
+    trickLED.TrickSegment of the strip and has its own interval. On every tick the animations that are
+    due calculate a frame, the segments are merged into the strip in the order they were added and the
+    strip is written once. Segments can sit side by side, or overlap as layers with a blend mode and
+    opacity, e.g. a LitBits sparkle layer added over Fire.
+
+    Layers are blended on the uncorrected bytes, before the strip applies its brightness and gamma in
+    write(). The add and screen modes therefore work on gamma encoded values, not linear light, see
+    bufops.blend_into.
+    """
+    def __init__(self, leds):
+        """
+        :param leds: TrickLED the segments belong to
+        """
+        self.leds = leds
+        self.animations = []
+        self.frame = 0
+
+    def segment(self, start, n, **kwargs):
+        """ Create a segment of n pixels starting at start. kwargs are passed to TrickSegment. """
+        return trickLED.TrickSegment(self.leds, start, n, **kwargs)
+
+    def layer(self, blend_mode=trickLED.BLEND_ADD, opacity=255, **kwargs):
+        """ Create a segment covering the whole strip that is blended over the segments added before it """
+        return trickLED.TrickSegment(self.leds, 0, self.leds.n, blend_mode=blend_mode, opacity=opacity, **kwargs)
+
+    def add(self, ani):
+        """ Add an animation whose leds are a segment of this strip """
+        if getattr(ani.leds, 'parent', None) is not self.leds:
+            raise ValueError('Animation must draw into a segment of the compositor strip')
+        self.animations.append(ani)
+        return ani
+
+    def compose(self):
+        """ Merge the segments into the strip if any of them has a new frame, returns True if merged """
+        segs = [ani.leds for ani in self.animations]
+        for seg in segs:
+            if seg.changed:
+                break
+        else:
+            return False
+        leds = self.leds
+        leds.normalize()
+        first = segs[0]
+        if not (first.blend_mode == trickLED.BLEND_COPY and first.opacity >= 255 and first.n == leds.n):
+            # start from black unless the bottom layer replaces the whole strip
+            bufops.fill_pattern(leds.buf, b'\x00')
+        for seg in segs:
+            seg.merge()
+        leds.mark_dirty()
+        return True
+
+    async def play(self, max_iterations=0):
+        """
+        Plays the animations
+
+        :param max_iterations: Number of ticks to run, a tick writes the strip once
+        """
+        leds = self.leds
+        anis = self.animations
+        leds.clear()
+        for ani in anis:
+            ani.leds.clear()
+            ani.setup()
+            ani.frame = 0
+            ani.skipped_frames = 0
+        self.frame = 0
+        now = time.ticks_us()
+        due = [now] * len(anis)
+        while anis and (max_iterations == 0 or self.frame < max_iterations):
+            # sleep until the next animation is due, rounding up so the loop does not spin
+            now = time.ticks_us()
+            wait = time.ticks_diff(due[0], now)
+            for i in range(1, len(anis)):
+                wait = min(wait, time.ticks_diff(due[i], now))
+            await asyncio.sleep_ms((wait + 999) // 1000 if wait > 0 else 0)
+            self.frame += 1
+            now = time.ticks_us()
+            for i in range(len(anis)):
+                if time.ticks_diff(now, due[i]) >= 0:
+                    ani = anis[i]
+                    ani.frame += 1
+                    ani.calc_frame()
+                    ani.leds.write()
+                    ival = ani.settings['interval'] * 1000
+                    due[i] = time.ticks_add(due[i], ival)
+                    late = time.ticks_diff(now, due[i])
+                    if ival > 0 and late >= ival:
+                        # drop missed frames like AnimationBase.play()
+                        ani.skipped_frames += late // ival
+                        due[i] = time.ticks_add(due[i], late // ival * ival)
+            self.compose()
+            leds.write()
+
+
+class MatrixAnimationBase(AnimationBase):
+    """ Base class for animations drawn on a TrickMatrix a row at a time. The frame is drawn on self.canvas,
+        one row after another in x order, and calc_rows() gets a memoryview of each row so it can fill,
+        blend and copy whole rows with bufops. calc_frame() copies the canvas to the panel with blit().
+        Strip animations play on a TrickMatrix as they are, along the strip.
+    """
+
+    def __init__(self, leds, **kwargs):
+        """
+        :param leds: TrickMatrix object
+        :param kwargs: see AnimationBase
+        """
+        if not isinstance(leds, trickLED.TrickMatrix):
+            raise ValueError('leds must be an instance of TrickMatrix')
+        super().__init__(leds, **kwargs)
+        self.canvas = None
+        self.rows = None
+        self.make_canvas()
+
+    def make_canvas(self):
+        """ Allocate the canvas for the rows the panel calculates. Called again by play() because the
+            repeat settings of the panel may have changed since __init__. """
+        leds = self.leds
+        self.width = leds.width
+        self.height = leds.rows
+        rb = self.width * leds.bpp
+        if self.canvas is None or len(self.canvas) != rb * self.height:
+            self.canvas = bytearray(rb * self.height)
+            mv = memoryview(self.canvas)
+            self.rows = [mv[y * rb:(y + 1) * rb] for y in range(self.height)]
+        else:
+            bufops.fill_pattern(self.canvas, b'\x00')
+        self.calc_n = self.width * self.height
+
+    async def play(self, max_iterations=0, **kwargs):
+        self.make_canvas()
+        await super().play(max_iterations, **kwargs)
+
+    def calc_rows(self, rows):
+        """
+        Draw the next frame on the canvas.
+
+        :param rows: List of memoryviews, one per row from the top, width * bpp bytes in strip byte order
+        """
+        pass
+
+    def calc_frame(self):
+        self.calc_rows(self.rows)
+        self.leds.blit(self.canvas)
+
+
 class SolidColor(AnimationBase):
     """
     Just an animation to set leds to a solid color
@@ -176,12 +384,14 @@ class NextGen(AnimationBase):
         # pre-fill the strip. Go in the opposite direction we are scrolling
         if self.settings['scroll_speed'] < 0:
             self.state['insert_point'] = self.calc_n - 1
-            for i in range(0, self.calc_n, blanks + 1):
-                self.leds[i] = next(self.generator)
+            if blanks:
+                for i in range(0, self.calc_n, blanks + 1):
+                    self.leds[i] = next(self.generator)
+            else:
+                self.leds.fill_gen(self.generator, 0, self.calc_n - 1)
         else:
             self.state['insert_point'] = 0
-            for i in range(self.calc_n - 1, -1,  -1):
-                self.leds[i] = next(self.generator)
+            self.leds.fill_gen(self.generator, 0, self.calc_n - 1, direction=-1)
 
     def calc_frame(self):
         self.leds.scroll(self.settings['scroll_speed'])
@@ -221,21 +431,21 @@ class LitBits(AnimationBase):
 
     def setup(self):
         if self.palette is None:
-            self.palette = default_palette(20, self.settings.get('brightness', 200))
+            self.palette = default_palette(20, self.settings.get('brightness', 255), self.rng)
         if self.settings.get('lit_percent'):
             self.lit.pct = self.settings.get('lit_percent')
-            self.lit.randomize()
+            self.lit.randomize(rng=self.rng)
 
     def calc_frame(self):
         if self.settings['lit_percent'] and self.frame % 30 == 0:
-            self.lit.randomize()
+            self.lit.randomize(rng=self.rng)
         pl = len(self.palette)
-        for i in range(self.calc_n):
-            if self.lit[i] == 1:
-                col = self.palette[i % pl]
-            else:
-                col = 0
-            self.leds[i] = col
+        palette = self.palette
+        leds = self.leds
+        # clear the section in one fill, then only visit the lit pixels
+        leds.fill_solid(0, 0, self.calc_n - 1)
+        for i in self.lit.iter_bits(1, self.calc_n):
+            leds[i] = palette[i % pl]
         self.palette.scroll(self.settings.get('scroll_speed', 1))
         self.lit.scroll(self.settings.get('lit_scroll_speed', -1))
 
@@ -265,37 +475,29 @@ class Jitter(LitBits):
         self.lit.pct = self.settings['lit_percent']
         self.settings['background'] = trickLED.colval(self.settings['background'])
         if not self.generator:
-            self.generator = generators.random_pastel(bpp=self.leds.bpp)
+            self.generator = generators.random_pastel(bpp=self.leds.bpp, rng=self.rng)
 
     def calc_frame(self):
         bg = self.settings.get('background')
         fade_percent = self.settings.get('fade_percent')
-        rv = getrandbits(8)
+        rv = self.rng.getrandbits(8)
         fill_mode = self.settings.get('fill_mode')
+        leds = self.leds
+        # fade the whole section toward the background, lit pixels are then handled a run at a time
+        leds.blend_to_color(bg, fade_percent, 0, self.calc_n - 1)
         if rv < self.settings.get('sparking'):
             # sparking
-            self.lit.randomize()
+            self.lit.randomize(rng=self.rng)
             spark_col = next(self.generator)
-            for i in range(self.calc_n):
-                if self.lit[i]:
-                    if fill_mode == trickLED.FILL_MODE_SOLID:
-                        col = spark_col
-                    else:
-                        col = next(self.generator)
-                    self.leds[i] = col
+            for start, end in self.lit.runs(1, self.calc_n):
+                if fill_mode == trickLED.FILL_MODE_SOLID:
+                    leds.fill_solid(spark_col, start, end - 1)
                 else:
-                    col = self.leds[i]
-                    if col != bg:
-                        col = trickLED.blend(col, bg, fade_percent)
-                        self.leds[i] = col
+                    leds.fill_gen(self.generator, start, end - 1)
         else:
-            # not sparking
-            for i in range(self.calc_n):
-                if self.lit[i]:
-                    col = trickLED.blend(self.leds[i], bg, fade_percent)
-                else:
-                    col = bg
-                self.leds[i] = col
+            # not sparking, unlit pixels go straight to the background
+            for start, end in self.lit.runs(0, self.calc_n):
+                leds.fill_solid(bg, start, end - 1)
 
 
 class SideSwipe(AnimationBase):
@@ -306,7 +508,7 @@ class SideSwipe(AnimationBase):
             self.generators = color_generators
         else:
             self.generators = []
-            self.generators.append(generators.random_vivid())
+            self.generators.append(generators.random_vivid(rng=self.rng))
             self.generators.append(generators.striped_color_wheel(hue_stride=20, stripe_size=10))
 
     def setup(self):
@@ -333,7 +535,7 @@ class Convergent(AnimationBase):
     def __init__(self, leds, fill_mode=None, **kwargs):
         super().__init__(leds, **kwargs)
         if self.palette is None:
-            self.palette = default_palette(20, self.settings['brightness'])
+            self.palette = default_palette(20, self.settings['brightness'], self.rng)
         self.settings['fill_mode'] = fill_mode or trickLED.FILL_MODE_SOLID
 
     def setup(self):
@@ -388,7 +590,7 @@ class Divergent(AnimationBase):
     def __init__(self, leds, fill_mode=None, **kwargs):
         super().__init__(leds, **kwargs)
         if self.palette is None:
-            self.palette = default_palette(20, self.settings['brightness'])
+            self.palette = default_palette(20, self.settings['brightness'], self.rng)
         self.settings['fill_mode'] = fill_mode or trickLED.FILL_MODE_SOLID
 
     def setup(self):
@@ -437,3 +639,32 @@ class Divergent(AnimationBase):
                 self.leds[ip] = self.state['color']
             mvr = self.state['insert_points'][:]
         self.state['movers'] = mvr
+
+
+class Cascade(MatrixAnimationBase):
+    """ Rows of color fall down the panel and fade as they go. A new row is taken from the generator every
+        frame.
+    """
+    def __init__(self, leds, generator=None, fade_percent=20, **kwargs):
+        """
+        :param leds: TrickMatrix
+        :param generator: Color generator for the top row
+        :param fade_percent: Percent to fade the rows each frame
+        """
+        if generator is None:
+            generator = generators.striped_color_wheel(hue_stride=10, stripe_size=1)
+        super().__init__(leds, generator=generator, **kwargs)
+        self.settings['fade_percent'] = int(fade_percent)
+
+    def setup(self):
+        self.state['black'] = bytes(self.leds.bpp)
+
+    def calc_rows(self, rows):
+        leds = self.leds
+        bpp = leds.bpp
+        # move every row down one, the bottom row drops off
+        for y in range(len(rows) - 1, 0, -1):
+            rows[y][:] = rows[y - 1]
+        alpha = bufops.pct_to_alpha(self.settings['fade_percent'])
+        bufops.blend_range(self.canvas, self.state['black'], alpha, 0, None, bpp)
+        self.generator.fill_into(rows[0], 0, self.width, leds.ORDER, bpp)
@@ -3,9 +3,10 @@ Animations that are CPU and memory intensive and only run on the ESP32.
 """
 
 from . import trickLED
+from . import bufops
 from . import generators
 
-from .animations import AnimationBase, getrandbits, randrange
+from .animations import AnimationBase
 
 try:
     import uasyncio as asyncio
@@ -19,8 +20,15 @@ class MappedAnimationBase(AnimationBase):
         super().__init__(leds, **kwargs)
         # bit shift if we need to map 0-255 values to a smaller palette size of 128, 64 or 32
         self.settings['palette_shift'] = 0
-        self.pixel_meta = trickLED.ByteMap(self.calc_n, 1)
+        if leds.index is not None and leds.index.n == self.calc_n:
+            # the strip is in indexed color mode, the metadata is the index plane and write() colorizes
+            self.pixel_meta = leds.index
+        else:
+            self.pixel_meta = trickLED.ByteMap(self.calc_n, 1)
         self._ordered_palette = None
+        # the ordered palette expanded to every metadata value with palette_shift applied, one table per channel
+        self._color_tables = None
+        self._color_shift = None
 
     def set_ordered_palette(self):
         """ Convert RGB palette to byte order of our strip.  """
@@ -30,29 +38,43 @@ class MappedAnimationBase(AnimationBase):
         op = self._ordered_palette
         for i in range(pal.n):
             op[i] = pal.get_ordered_item(i)
+        self._color_shift = None
+
+    def _expand_palette(self, shift):
+        """
+        Build the color of every metadata value 0-255 as one 256 byte table per channel. Value 0 is always
+        off, values past the end of the palette use its last color.
+        """
+        pal = self._ordered_palette
+        self._color_tables = bufops.expand_palette(pal.buf, pal.n, pal.bpi, shift=shift, zero=True)
+        self._color_shift = shift
 
     def colorize(self):
         """ Convert pixel meta data to colors.  To improve speed:
-        1) We write directly to the leds buffer
-        2) Pre-convert the palette from RGB to strip byte order (probably GRB)
+        1) We write directly to the leds back buffer
+        2) Pre-convert the palette from RGB to strip byte order (probably GRB) and expand it to all 256
+           metadata values, so each pixel is a table lookup per channel
+
+        On MicroPython this does not allocate. On CPython bufops.map_palette translates each channel into
+        a temporary bytes object, which is faster there than the index loop.
         """
-        buf = bytearray()
-        pal = self._ordered_palette
-        meta = self.pixel_meta
+        leds = self.leds
         shift = self.settings.get('palette_shift', 0)
-        zero = bytearray([0,0,0])
-        bpi = pal.bpi
-        for m in meta:
-            if m:
-                i = (m >> shift) * bpi
-                buf += pal.buf[i:i+bpi]
-            else:
-                buf += zero
-        self.leds.buf = buf
-#         if len(self.leds.buf) == len(buf):   
-#             self.leds.buf = buf
-#         else:
-#             raise Exception('buffer length changed')
+        if self._color_shift != shift:
+            self._expand_palette(shift)
+        meta = self.pixel_meta
+        if meta is leds.index:
+            leds.set_palette(tables=self._color_tables)
+            return
+        # metadata is mapped in logical order, the leds must not have a pending scroll offset
+        leds.normalize()
+        tables = self._color_tables
+        # read the metadata in logical order, starting at its scroll offset
+        po = meta._po
+        bufops.map_palette(leds.buf, meta.buf, tables, 0, po, meta.n)
+        if po:
+            bufops.map_palette(leds.buf, meta.buf, tables, (meta.n - po) * len(tables), 0, po)
+        leds.mark_dirty()
 
 
 class Fire(MappedAnimationBase):
@@ -78,6 +100,8 @@ class Fire(MappedAnimationBase):
         # we map 256 heat levels to a palette of 64, 128 or 256, calculated in setup()
         self.settings['palette_shift'] = 0
         self._flash_points = None
+        self._sparks = None
+        self._blend_runs = ()
         if 'palette' in kwargs and kwargs['palette']:
             if len(kwargs['palette']) >= 64:
                 self.palette = kwargs['palette']
@@ -104,14 +128,14 @@ class Fire(MappedAnimationBase):
             bmin = -10
             bmax = 1
         else:
-            self._flash_points.add(randrange(0, self.calc_n - 1))
+            self._flash_points.add(self.rng.randrange(0, self.calc_n - 1))
             bmin = -5
             bmax = 6
 
         sect_size = self.calc_n // self.settings['hotspots']
         for i in range(1, self.settings['hotspots']):
             # add additional flash_points with some randomness so they are not exactly evenly spaced
-            rn = getrandbits(4) - 8
+            rn = self.rng.getrandbits(4) - 8
             ip = sect_size * i + rn
             if not 0 < ip < self.calc_n:
                 ip = min(max(ip, 0), self.calc_n - 1)
@@ -123,6 +147,9 @@ class Fire(MappedAnimationBase):
             for i in range(fp + bmin, fp + bmax):
                 if 0 <= i < self.calc_n and i not in self._flash_points:
                     self._blend_map[i] = 1
+        self._sparks = bytearray(len(self._flash_points))
+        # (start, end) of each run of pixels to blend
+        self._blend_runs = tuple(self._blend_map.runs(1, self.calc_n))
 
         # determine if we are mapping 256 levels of heat to 64, 128 or 256 colors
         if len(self.palette) >= 256:
@@ -133,36 +160,30 @@ class Fire(MappedAnimationBase):
             self.settings['palette_shift'] = 2
 
     def calc_frame(self):
-        uint8 = trickLED.uint8
-        cn = self.calc_n
-        mi = cn - 1
+        meta = self.pixel_meta
         if self.settings['scroll_speed'] != 0:
-            self.pixel_meta.scroll(self.settings['scroll_speed'])
+            meta.scroll(self.settings['scroll_speed'])
 
         # calculate sparks at insertion points
-        for ip in self._flash_points:
-            spark = getrandbits(8)
-            if spark <= self.settings['sparking']:
+        sparking = self.settings['sparking']
+        # one random byte per insertion point, drawn in one call
+        sparks = self.rng.fill(self._sparks)
+        for ip, spark in zip(self._flash_points, sparks):
+            if spark <= sparking:
                 # add a spark at insert_point with random heat between 192 and 255
                 val = 192 + (spark & 63)
             else:
                 val = (spark & 127) | 64
-            self.pixel_meta[ip] = val
-
-        # blend - copy heat map so we don't "cool" as we are blending
-        heat_map = trickLED.ByteMap(self.calc_n, bpi=1)
-        heat_map.buf = self.pixel_meta.buf[:]
-        for i in range(self.calc_n):
-            if self._blend_map[i]:
-                if 0 < i < mi:
-                    val = sum(heat_map[i-1:i+2]) / 3
-                elif i == 0:
-                    val = sum(heat_map[0:2]) / 2
-                else:
-                    val = sum(heat_map[-2:]) / 2
-                self.pixel_meta[i] = uint8(val)
+            meta[ip] = val
+
+        # blend in place, each run of the blend map is blurred with the values from before blending
+        meta.normalize()
+        buf = meta.buf
+        cn = self.calc_n
+        for start, end in self._blend_runs:
+            bufops.box_blur3(buf, start, end, cn)
         # cool
-        self.pixel_meta.sub(self.settings.get('cooling'))
+        meta.sub(self.settings.get('cooling'))
         self.colorize()
 
 
@@ -184,12 +205,12 @@ class Conjunction(MappedAnimationBase):
 
     def start_cycle(self):
         self.pixel_meta.fill(0)
-        self.leds.fill(0)
+        self.leds.clear()
         self.palette.fill_gen(self.generator, start_pos=1, direction=-1)
         self.palette[0] = trickLED.colval(0)
         self.set_ordered_palette()
         self.state['step'] = 0
-        rn = getrandbits(5) # 0-31
+        rn = self.rng.getrandbits(5) # 0-31
         self.state['insert_points'] = [rn - 32, rn]
         while rn < self.calc_n:
             rn += 32
@@ -0,0 +1,454 @@
+"""
+In-place kernels for pixel and metadata buffers. Saturating arithmetic is done through 256 byte lookup
+tables (qadd8, qsub8, scale8 style) so a frame never allocates a new buffer. Gradients and blends use
+fixed point integers instead of floats.
+"""
+from micropython import const
+
+from .cache import LRUCache
+
+OP_ADD = const(1)
+OP_SUB = const(2)
+OP_MUL = const(3)
+OP_DIV = const(4)
+OP_BLEND = const(5)
+OP_OPACITY = const(6)
+
+# how a layer is merged into the buffer below it, see blend_into
+BLEND_COPY = const(0)
+BLEND_ADD = const(1)
+BLEND_SCREEN = const(2)
+BLEND_MAX = const(3)
+BLEND_ALPHA = const(4)
+
+# CPython can map a strided slice in one call, MicroPython falls back to an index loop
+_TRANSLATE = hasattr(bytearray, 'translate')
+# MicroPython does not support assigning to a strided slice
+try:
+    bytearray(2)[0::2] = b'\x00'
+    _STRIDED = True
+except (NotImplementedError, TypeError, ValueError):
+    _STRIDED = False
+
+# lookup tables keyed by (op, value)
+luts = LRUCache(16 * 256)
+
+
+def _build_lut(op, val):
+    tbl = bytearray(256)
+    for i in range(256):
+        if op == OP_ADD:
+            v = i + val
+        elif op == OP_SUB:
+            v = i - val
+        elif op == OP_MUL:
+            v = i * val
+        elif op == OP_BLEND:
+            v = i + (((val[0] - i) * val[1]) >> 8)
+        elif op == OP_OPACITY:
+            v = i * val // 255
+        else:
+            v = i / val
+        if v < 0:
+            v = 0
+        elif v > 255:
+            v = 255
+        tbl[i] = int(v)
+    return tbl
+
+
+def lut(op, val):
+    """ Return the 256 byte table that applies op with val to a byte, saturating at 0 and 255. """
+    key = (op, val)
+    tbl = luts.get(key)
+    if tbl is None:
+        tbl = luts.put(key, _build_lut(op, val))
+    return tbl
+
+
+def qadd8(val):
+    """ Table for saturating addition of val """
+    return lut(OP_ADD, val)
+
+
+def qsub8(val):
+    """ Table for saturating subtraction of val """
+    return lut(OP_SUB, val)
+
+
+def scale8(val):
+    """ Table for saturating multiplication by val """
+    return lut(OP_MUL, val)
+
+
+def div8(val):
+    """ Table for division by val """
+    return lut(OP_DIV, val)
+
+
+def blend8(target, alpha):
+    """ Table that blends a byte toward target, alpha is the 8.8 fixed point fraction of target (0-256) """
+    return lut(OP_BLEND, (target, alpha))
+
+
+def pct_to_alpha(pct):
+    """ Convert a percentage 0-100 to an 8.8 fixed point fraction 0-256 """
+    return (pct * 256 + 50) // 100
+
+
+def apply_lut(buf, tbl, start=0, end=None, step=1):
+    """
+    Replace each byte of buf[start:end:step] with its value in tbl.
+
+    :param buf: bytearray to modify in place
+    :param tbl: 256 byte lookup table
+    :param start: First byte
+    :param end: End byte (exclusive), defaults to end of buffer
+    :param step: Byte stride, use bpp and a channel offset for start to map a single channel
+    """
+    if end is None:
+        end = len(buf)
+    if _TRANSLATE:
+        buf[start:end:step] = buf[start:end:step].translate(tbl)
+    else:
+        for i in range(start, end, step):
+            buf[i] = tbl[buf[i]]
+
+
+def apply_op(buf, op, val, end=None, bpp=1):
+    """
+    Apply a saturating operation to the first end bytes of buf in place.
+
+    :param buf: bytearray to modify
+    :param op: OP_ADD, OP_SUB, OP_MUL or OP_DIV
+    :param val: Single value for all bytes, or a list/tuple with one value per channel
+    :param end: End byte (exclusive), defaults to end of buffer
+    :param bpp: Bytes per item, used to stride per channel values
+    """
+    if isinstance(val, (list, tuple)):
+        for c in range(bpp):
+            apply_lut(buf, lut(op, val[c]), c, end, bpp)
+    else:
+        apply_lut(buf, lut(op, val), 0, end)
+
+
+def rotate_into(dst, src, shift, end):
+    """
+    Copy src[0:end] into dst[0:end] rotated left by shift bytes. dst and src must be different buffers.
+
+    :param dst: Destination buffer
+    :param src: Source buffer
+    :param shift: Number of bytes to rotate, the byte at src[shift] ends up at dst[0]
+    :param end: Number of bytes to copy
+    """
+    mv = memoryview(src)
+    k = end - shift
+    dst[0:k] = mv[shift:end]
+    dst[k:end] = mv[0:shift]
+
+
+def fill_pattern(buf, pattern, start=0, end=None):
+    """
+    Fill buf[start:end] by repeating pattern. The pattern is written once and the filled part is then
+    doubled with slice copies, so a fill costs a handful of memory copies regardless of length.
+
+    :param buf: bytearray to fill
+    :param pattern: Bytes to repeat, usually one pixel in strip byte order
+    :param start: First byte
+    :param end: End byte (exclusive), defaults to end of buffer
+    """
+    if end is None:
+        end = len(buf)
+    total = end - start
+    size = len(pattern)
+    if total <= size:
+        if total > 0:
+            buf[start:end] = memoryview(pattern)[0:total]
+        return
+    buf[start:start + size] = pattern
+    mv = memoryview(buf)
+    done = size
+    while done < total:
+        k = min(done, total - done)
+        buf[start + done:start + done + k] = mv[start:start + k]
+        done += k
+
+
+def fill_gradient(buf, px1, px2, start, steps, bpp=3):
+    """
+    Write steps + 1 items starting at byte start, fading from px1 to px2. Each channel is interpolated
+    in fixed point with a byte stride, so no tuples are created per pixel. 16 fractional bits are used
+    instead of 8 so long gradients don't drift from the float result.
+
+    :param buf: bytearray to fill
+    :param px1: Bytes of the first item
+    :param px2: Bytes of the last item
+    :param start: First byte
+    :param steps: Number of steps between px1 and px2
+    :param bpp: Bytes per item
+    """
+    end = start + steps * bpp
+    for c in range(bpp):
+        v = (px1[c] << 16) + 32768
+        inc = ((px2[c] - px1[c]) << 16) // steps if steps else 0
+        for j in range(start + c, end, bpp):
+            buf[j] = v >> 16
+            v += inc
+        buf[end + c] = px2[c]
+
+
+def blend_range(buf, px, alpha, start=0, end=None, bpp=3):
+    """
+    Blend buf[start:end] toward the color px in place. Each channel is mapped through an 8.8 fixed point
+    blend table, the result is within +/-1 of the float blend().
+
+    :param buf: bytearray to modify
+    :param px: Bytes of the color to blend toward, in buffer byte order
+    :param alpha: 8.8 fixed point fraction of px, 0 keeps buf and 256 replaces it with px, see pct_to_alpha()
+    :param start: First byte, must be the start of an item
+    :param end: End byte (exclusive), defaults to end of buffer
+    :param bpp: Bytes per item
+    """
+    if end is None:
+        end = len(buf)
+    for c in range(bpp):
+        apply_lut(buf, blend8(px[c], alpha), start + c, end, bpp)
+
+
+def reverse_items(buf, start, end, size=3):
+    """
+    Reverse the order of the items in buf[start:end] in place, keeping the bytes of each item in order.
+
+    :param buf: bytearray to modify
+    :param start: First byte
+    :param end: End byte (exclusive)
+    :param size: Bytes per item
+    """
+    mv = memoryview(buf)
+    tmp = bytearray(size)
+    lo = start
+    hi = end - size
+    while lo < hi:
+        tmp[:] = mv[lo:lo + size]
+        buf[lo:lo + size] = mv[hi:hi + size]
+        buf[hi:hi + size] = tmp
+        lo += size
+        hi -= size
+
+
+def reverse_into(dst, src, end, size=3):
+    """
+    Copy the items of src[0:end] into dst[0:end] in reverse order, keeping the bytes of each item in order.
+    dst and src must be different buffers.
+
+    :param dst: Destination buffer
+    :param src: Source buffer
+    :param end: Number of bytes to copy
+    :param size: Bytes per item
+    """
+    if _STRIDED:
+        for c in range(size):
+            dst[c:end:size] = src[c:end:size][::-1]
+    else:
+        k = end - size
+        for j in range(0, end, size):
+            for c in range(size):
+                dst[j + c] = src[k + c]
+            k -= size
+
+
+def replicate_plan(period, end, filled=None):
+    """
+    Return the slice copies that repeat buf[0:period] up to byte end. Each copy is a (start, length) pair
+    meaning buf[start:start + length] = buf[0:length]. The repeated part doubles with every copy, so
+    the plan has about log2(end / period) steps.
+
+    :param period: Length of the repeating pattern in bytes
+    :param end: End byte (exclusive)
+    :param filled: Number of bytes already in place, a multiple of period. Defaults to period
+    """
+    plan = []
+    loc = filled or period
+    while loc < end:
+        k = min(loc, end - loc)
+        plan.append((loc, k))
+        loc += k
+    return tuple(plan)
+
+
+def replicate(buf, plan):
+    """ Run the slice copies returned by replicate_plan on buf. """
+    mv = memoryview(buf)
+    for loc, k in plan:
+        buf[loc:loc + k] = mv[0:k]
+
+
+def map_palette(dst, src, tables, start=0, src_start=0, src_end=None):
+    """
+    Look up each byte of src[src_start:src_end] in a palette and write the colors to dst. The palette is
+    given as one 256 byte table per channel, so a color is written as dst[j + c] = tables[c][src[i]].
+
+    :param dst: Destination buffer
+    :param src: Buffer of palette indexes, e.g. the metadata of a MappedAnimation
+    :param tables: One 256 byte table per byte of a color, in the order they are written
+    :param start: First byte of dst
+    :param src_start: First byte of src
+    :param src_end: End byte of src (exclusive), defaults to end of src
+    """
+    if src_end is None:
+        src_end = len(src)
+    bpp = len(tables)
+    end = start + (src_end - src_start) * bpp
+    if _TRANSLATE and _STRIDED:
+        idx = src[src_start:src_end]
+        for c in range(bpp):
+            dst[start + c:end:bpp] = idx.translate(tables[c])
+    elif bpp == 3:
+        t0, t1, t2 = tables
+        j = start
+        for i in range(src_start, src_end):
+            m = src[i]
+            dst[j] = t0[m]
+            dst[j + 1] = t1[m]
+            dst[j + 2] = t2[m]
+            j += 3
+    else:
+        j = start
+        for i in range(src_start, src_end):
+            m = src[i]
+            for c in range(bpp):
+                dst[j + c] = tables[c][m]
+            j += bpp
+
+
+def box_blur3(buf, start, end, n=None):
+    """
+    Replace each byte of buf[start:end] with the average of itself and its two neighbours, using the
+    values from before the blur. The first and last byte of the buffer average with their only neighbour.
+    Runs in place, the original of the previous byte is carried along instead of copying the buffer.
+
+    :param buf: bytearray of values, e.g. a heat map
+    :param start: First byte to blur
+    :param end: End byte (exclusive)
+    :param n: Length of the data in buf, defaults to len(buf)
+    """
+    if n is None:
+        n = len(buf)
+    mi = n - 1
+    if start >= end or mi < 1:
+        return
+    i = start
+    if i == 0:
+        prev = buf[0]
+        buf[0] = (prev + buf[1]) // 2
+        i = 1
+    else:
+        prev = buf[i - 1]
+    last = min(end, mi)
+    while i < last:
+        cur = buf[i]
+        buf[i] = (prev + cur + buf[i + 1]) // 3
+        prev = cur
+        i += 1
+    if end > mi and i == mi:
+        buf[mi] = (prev + buf[mi]) // 2
+
+
+def expand_palette(colors, count, bpi=3, order=(0, 1, 2, 3), shift=0, zero=False):
+    """
+    Expand a palette to all 256 index values as one 256 byte table per byte of a pixel, the tables used by
+    map_palette. Index m uses palette entry m >> shift, indexes past the end use the last entry.
+
+    :param colors: Buffer of packed palette colors
+    :param count: Number of colors in the palette
+    :param bpi: Bytes per color
+    :param order: Byte position in the pixel of each color channel, e.g. TrickLED.ORDER
+    :param shift: Bit shift to map 256 index values to a smaller palette
+    :param zero: If True, index 0 is always off
+    """
+    last = count - 1
+    tables = [bytearray(256) for _ in range(bpi)]
+    for m in range(1 if zero else 0, 256):
+        k = min(m >> shift, last) * bpi
+        for c in range(bpi):
+            tables[order[c]][m] = colors[k + c]
+    return [bytes(t) for t in tables]
+
+
+def blend_into(dst, src, start=0, mode=BLEND_COPY, opacity=255):
+    """
+    Merge the bytes of src into dst[start:start + len(src)], like a layer over the layers below it.
+    Every mode works a byte at a time with integers, no colors are created.
+
+    :param dst: Buffer below, modified in place
+    :param src: Layer buffer
+    :param start: First byte of dst
+    :param mode: BLEND_COPY replaces dst, BLEND_ADD adds with saturation, BLEND_SCREEN brightens like
+                 overlapping lights, BLEND_MAX keeps the brighter byte, BLEND_ALPHA mixes by opacity.
+                 The bytes are blended as stored, which is before the gamma of a correction is applied
+                 in write(). With a gamma above 1 they are gamma encoded, not linear light, so BLEND_ADD
+                 and BLEND_SCREEN come out brighter than the sum of two real lights would.
+    :param opacity: 0-255, strength of the layer
+    """
+    n = len(src)
+    if mode == BLEND_COPY and opacity >= 255:
+        dst[start:start + n] = src
+        return
+    if mode == BLEND_COPY or mode == BLEND_ALPHA:
+        # dst + (src - dst) * opacity, done as two scaled tables so there are no negative numbers
+        ts = lut(OP_OPACITY, opacity)
+        td = lut(OP_OPACITY, 255 - opacity)
+        for i in range(n):
+            dst[start + i] = ts[src[i]] + td[dst[start + i]]
+        return
+    ts = lut(OP_OPACITY, opacity) if opacity < 255 else None
+    j = start
+    if mode == BLEND_ADD:
+        for i in range(n):
+            v = dst[j] + (ts[src[i]] if ts else src[i])
+            dst[j] = v if v < 256 else 255
+            j += 1
+    elif mode == BLEND_SCREEN:
+        for i in range(n):
+            d = dst[j]
+            v = ts[src[i]] if ts else src[i]
+            dst[j] = d + v - d * v // 255
+            j += 1
+    elif mode == BLEND_MAX:
+        for i in range(n):
+            v = ts[src[i]] if ts else src[i]
+            if v > dst[j]:
+                dst[j] = v
+            j += 1
+    else:
+        raise ValueError('Unknown blend mode {}'.format(mode))
+
+
+def correction_tables(brightness=255, gamma=1, white_balance=None, order=(0, 1, 2, 3), bpp=3):
+    """
+    Build the tables that apply brightness, gamma and white balance to a frame, one 256 byte table per byte
+    of a pixel in strip byte order. Returns None when the correction would not change any value.
+
+    :param brightness: 0-255
+    :param gamma: Gamma exponent, 1 is linear
+    :param white_balance: Scale 0-255 per channel in RGB(W) order
+    :param order: Byte position of each color channel, e.g. TrickLED.ORDER
+    :param bpp: Bytes per pixel
+    """
+    wb = tuple(white_balance or ()) + (255,) * bpp
+    if brightness >= 255 and gamma == 1 and min(wb[:bpp]) >= 255:
+        return None
+    curve = [255 * (i / 255) ** gamma for i in range(256)] if gamma != 1 else list(range(256))
+    tables = [None] * bpp
+    for c in range(bpp):
+        scale = brightness * wb[c] / 65025
+        tables[order[c]] = bytes(int(v * scale + 0.5) for v in curve)
+    return tables
+
+
+def apply_tables(buf, tables, end=None, start=0):
+    """ Map each byte of a pixel buffer through the table of its position in the pixel, start must be the
+        first byte of a pixel """
+    bpp = len(tables)
+    for c in range(bpp):
+        apply_lut(buf, tables[c], start + c, end, bpp)
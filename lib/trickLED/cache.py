@@ -0,0 +1,56 @@
+class LRUCache:
+    """
+    Least recently used cache for byte tables. Items are evicted oldest first once the combined length
+    of the stored values exceeds the byte budget. The most recently added item is always kept.
+    """
+    def __init__(self, budget=8192):
+        """
+        :param budget: Maximum number of bytes to keep
+        """
+        self.budget = budget
+        self.size = 0
+        self._items = {}
+        # recency of each key, higher is more recent
+        self._used = {}
+        self._tick = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, default=None):
+        """ Return the cached value and mark it as most recently used. """
+        val = self._items.get(key)
+        if val is None:
+            return default
+        self._tick += 1
+        self._used[key] = self._tick
+        return val
+
+    def put(self, key, val):
+        """ Add a value to the cache, evicting least recently used values if over budget. """
+        if key in self._items:
+            self.size -= len(self._items[key])
+        self._items[key] = val
+        self._tick += 1
+        self._used[key] = self._tick
+        self.size += len(val)
+        self.evict()
+        return val
+
+    def evict(self, budget=None):
+        """ Drop least recently used values until the cache fits in budget. """
+        if budget is not None:
+            self.budget = budget
+        used = self._used
+        while self.size > self.budget and len(used) > 1:
+            key = min(used, key=used.get)
+            del used[key]
+            self.size -= len(self._items.pop(key))
+
+    def clear(self):
+        self._items = {}
+        self._used = {}
+        self.size = 0
@@ -0,0 +1,50 @@
+"""
+Precomputed color tables. The 255 step color wheel is stored as packed RGB byte tables, one table per
+brightness level, so converting a hue to a color is a single table index instead of float math. Tables are
+built the first time a brightness level is used and kept in an LRU cache.
+"""
+from micropython import const
+
+from .cache import LRUCache
+
+WHEEL_SIZE = const(255)
+
+# a wheel table is 765 bytes, the default budget keeps 32 brightness levels
+tables = LRUCache(32 * WHEEL_SIZE * 3)
+
+
+def _clamp(val):
+    if val < 0:
+        return 0
+    if val > 255:
+        return 255
+    return int(val)
+
+
+def build_wheel(val=255):
+    """ Build the packed RGB color wheel at brightness val. """
+    val = _clamp(val)
+    buf = bytearray(WHEEL_SIZE * 3)
+    ss = val / 85
+    for hue in range(WHEEL_SIZE):
+        ci = _clamp(ss * (hue % 85))
+        cd = val - ci
+        i = hue * 3
+        if hue < 85:
+            buf[i] = cd
+            buf[i + 1] = ci
+        elif hue < 170:
+            buf[i + 1] = cd
+            buf[i + 2] = ci
+        else:
+            buf[i] = ci
+            buf[i + 2] = cd
+    return buf
+
+
+def wheel(val=255):
+    """ Return the packed RGB color wheel at brightness val. Hue h is at bytes h * 3 to h * 3 + 2. """
+    tbl = tables.get(val)
+    if tbl is None:
+        tbl = tables.put(val, build_wheel(val))
+    return tbl
@@ -0,0 +1,71 @@
+"""
+Per-frame timings for AnimationBase.play(). Timings are kept in fixed size ring buffers so recording a
+frame does not allocate, summaries can be read from another task while the animation runs.
+"""
+from array import array
+
+try:
+    from gc import mem_alloc
+except ImportError:
+    mem_alloc = None
+
+# fields recorded for every frame
+CALC = 0       # us spent in calc_frame()
+WRITE = 1      # us spent in write(), including repeat expansion
+LATE = 2       # us the next frame started after its deadline
+ALLOC = 3      # bytes of heap allocated during calc_frame() and write()
+FIELDS = ('calc_us', 'write_us', 'late_us', 'alloc')
+
+
+class FrameStats:
+    def __init__(self, size=128):
+        """
+        :param size: Number of frames to keep
+        """
+        self.size = size
+        self.rings = [array('l', [0] * size) for _ in FIELDS]
+        # number of frames recorded, the ring is full once this reaches size
+        self.frames = 0
+        # frames where nothing changed so the strip was not sent
+        self.skipped_writes = 0
+        # frames dropped by the scheduler to catch up
+        self.skipped_frames = 0
+
+    def record(self, calc_us, write_us, late_us, alloc=0):
+        """ Store the timings of one frame, overwriting the oldest once the ring is full """
+        i = self.frames % self.size
+        r = self.rings
+        r[CALC][i] = calc_us
+        r[WRITE][i] = write_us
+        r[LATE][i] = late_us
+        r[ALLOC][i] = alloc
+        self.frames += 1
+
+    def reset(self):
+        self.frames = 0
+        self.skipped_writes = 0
+        self.skipped_frames = 0
+
+    def values(self, field):
+        """ Return the recorded values of a field, sorted """
+        n = min(self.frames, self.size)
+        return sorted(self.rings[field][i] for i in range(n))
+
+    def summary(self):
+        """ Return {field: (p50, p99, max)} over the frames in the ring """
+        out = {}
+        for f in range(len(FIELDS)):
+            vals = self.values(f)
+            if vals:
+                last = len(vals) - 1
+                out[FIELDS[f]] = (vals[last * 50 // 100], vals[last * 99 // 100], vals[last])
+            else:
+                out[FIELDS[f]] = (0, 0, 0)
+        return out
+
+    def print(self):
+        print('frames: {} skipped writes: {} skipped frames: {}'.format(
+            self.frames, self.skipped_writes, self.skipped_frames))
+        for name, (p50, p99, mx) in self.summary().items():
+            print('{:<13} p50 {:>7d} p99 {:>7d} max {:>7d}'.format(name, p50, p99, mx))
+
@@ -1,146 +1,423 @@
 from . import trickLED
-from random import getrandbits 
-try:
-    from random import randrange
-except ImportError:
-    randrange = trickLED.randrange
+from . import colortable
+from . import bufops
+from . import prng
+from .cache import LRUCache
 
+RGB_ORDER = trickLED.RGB_ORDER
+# generators produce full brightness colors, write() dims them to TrickLED.brightness, see set_correction()
+FULL = 255
 
-def stepped_color_wheel(hue_stride=10, stripe_size=20, start_hue=0):
-    """
-    Generator that cycles through the color wheel creating stripes that fade to
-    a slightly different hue.
+# one full period of each periodic generator, keyed by its settings and byte order. Change the byte budget
+# with periods.evict(budget), generators whose period does not fit are calculated a stripe at a time.
+periods = LRUCache(16 * 1024)
 
-    :param hue_stride: Number of steps on the color wheel to skip, negative will go in reverse.
-    :param stripe_size: Size of fading stripe
-    :param start_hue: Starting hue on color wheel
-    :return: color generator
-    """
-    if hue_stride == 0:
-        hue_stride = 1
-    hue = start_hue
-
-    ho = - hue_stride
-    while True:
-        brightness = trickLED.global_setings.get('brightness')
-        db = brightness >> 2
-        c1 = trickLED.color_wheel(hue, brightness)
-        c2 = trickLED.color_wheel((hue - ho) % 255, db)
-        inc = trickLED.step_inc(c1, c2, stripe_size - 1)
-        for i in range(stripe_size):
-            incs = [v * i for v in inc]
-            yield tuple(map(trickLED.add8, c1, incs))
-        hue = (hue + hue_stride) % 255
-
-
-def striped_color_wheel(hue_stride=10, stripe_size=10, start_hue=0):
+
+def _gcd(a, b):
+    while b:
+        a, b = b, a % b
+    return a
+
+
+class ColorGenerator:
     """
-    Generator that cycles through the color wheel creating stripes of the same color before moving to next hue.
+    Base class for color generators. Generators are iterators that return one color tuple per call to next().
+    They also support a block protocol, fill_into() writes the next colors straight into a buffer in the
+    byte order of the strip without creating a tuple per pixel.
 
-    :param hue_stride: Number of steps on the color wheel to skip, negative will go in reverse.
-    :param stripe_size: Number of times to repeat each color
-    :param start_hue: Starting hue on color wheel
-    :return: color generator
+    Subclasses implement __next__(), fill_into() or both. Each has a default that uses the other one.
     """
-    hue = start_hue
-    if hue_stride == 0:
-        hue_stride = 1
-    while True:
-        col = trickLED.color_wheel(hue, trickLED.global_setings.get('brightness'))
-        for i in range(stripe_size):
-            yield col
-        hue = (hue + hue_stride) % 255
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if type(self).fill_into is ColorGenerator.fill_into:
+            raise TypeError('{} must implement __next__ or fill_into'.format(self.__class__.__name__))
+        px = bytearray(3)
+        self.fill_into(px, 0, 1)
+        return px[0], px[1], px[2]
 
+    def fill_into(self, buf, offset, count, order=RGB_ORDER, bpp=3):
+        """
+        Write the next count colors into buf. Channels the color does not have, like the white byte of an
+        RGBW strip, are set to 0. With bpp=1 an int from the generator is stored as is, otherwise the first
+        channel of the color is stored.
 
-def fading_color_wheel(hue_stride=10, stripe_size=20, start_hue=0, mode=trickLED.FADE_OUT):
+        :param buf: bytearray to write to
+        :param offset: Byte offset of the first color
+        :param count: Number of colors to write
+        :param order: Byte position of each color channel in a pixel, e.g. TrickLED.ORDER
+        :param bpp: Bytes per pixel
+        """
+        if bpp == 1:
+            for j in range(offset, offset + count):
+                col = next(self)
+                buf[j] = col if isinstance(col, int) else col[0]
+            return
+        for j in range(offset, offset + count * bpp, bpp):
+            col = next(self)
+            n = min(len(col), bpp)
+            for c in range(n):
+                buf[j + order[c]] = col[c]
+            for c in range(n, bpp):
+                buf[j + order[c]] = 0
+
+
+class StripeGenerator(ColorGenerator):
     """
-    Cycle through color wheel while fading in and out before moving to next hue.
+    Base class for generators that produce a stripe of colors at a time. Subclasses implement next_stripe()
+    to fill self.stripe with the RGB bytes of the next stripe, there is no default.
 
-    :param hue_stride: Number of steps on the color wheel to skip. Negative will go in reverse
-    :param strip_size: Length of the fade in, fade out cycle where hue remains the same
-    :param start_hue: Location on color wheel to begin
-    :param mode: Fade in, fade out, fade in then out
-    :return: color generator
+    Generators that step around the color wheel repeat after 255 / gcd(hue_stride, 255) stripes. If they
+    call _set_period() the whole period is calculated once into a table shared through the periods cache,
+    and colors are then served from the table.
     """
-    if stripe_size <= 1:
-        raise ValueError('stripe_size must be > 1 to fade')
-    hue = start_hue
-    # calculate brightness values
-    if mode == trickLED.FADE_IN_OUT:
-        cs = 127.5 / (stripe_size - 1)
-        co = 0
-        bv = [2 + int(trickLED.sin8(co + i * cs) * 253) for i in range(stripe_size)]
-    else:
-        if mode == trickLED.FADE_IN:
-            cs = 63.75 / (stripe_size - 1)
-            co = 63.75
-        else:
-            cs = 63.75 / (stripe_size - 1)
+    def __init__(self, stripe_len):
+        self.stripe = bytearray(stripe_len * 3)
+        # current stripe converted to the byte order last passed to fill_into
+        self._ordered = bytearray(stripe_len * 3)
+        self._order = None
+        # position in the current stripe, the first call to next() starts a new stripe
+        self._pos = stripe_len
+        self._len = stripe_len
+        # cached period, see _set_period()
+        self._key = None
+        self._plen = 0
+        self._tpos = 0
+        self._table = None
+        self._otable = None
+        self._torder = None
+
+    def _set_period(self, *settings):
+        """
+        Serve colors from a cached table of one period. Call at the end of __init__ with every setting that
+        changes the colors, next_stripe() must step self.hue by self.hue_stride.
+        """
+        if not (isinstance(self.hue, int) and isinstance(self.hue_stride, int) and 0 <= self.hue < 255):
+            # the first hue would not repeat exactly
+            return
+        stripes = 255 // _gcd(self.hue_stride % 255, 255) if self.hue_stride % 255 else 1
+        plen = stripes * self._len
+        if plen * 3 > periods.budget:
+            return
+        self._key = (self.__class__.__name__, self.hue, self.hue_stride, self._len) + settings
+        self._plen = plen
+
+    def _period_table(self, order):
+        """ Return the table of one period in the given byte order, building it the first time """
+        o = (order[0], order[1], order[2])
+        key = self._key + o
+        tbl = periods.get(key)
+        if tbl is None:
+            # replay the period from the start hue, the live hue is only used when there is no table
+            hue = self.hue
+            self.hue = self._key[1]
+            n = self._len * 3
+            tbl = bytearray(self._plen * 3)
+            for j in range(0, len(tbl), n):
+                self.next_stripe()
+                tbl[j:j + n] = self.stripe
+            self.hue = hue
+            if o != (0, 1, 2):
+                rgb = bytes(tbl)
+                for i in range(0, len(tbl), 3):
+                    tbl[i + o[0]] = rgb[i]
+                    tbl[i + o[1]] = rgb[i + 1]
+                    tbl[i + o[2]] = rgb[i + 2]
+            tbl = periods.put(key, bytes(tbl))
+        return tbl
+
+    def _advance(self):
+        self.next_stripe()
+        self._pos = 0
+        self._order = None
+
+    def __next__(self):
+        if self._key:
+            if self._table is None:
+                self._table = self._period_table(RGB_ORDER)
+            i = self._tpos * 3
+            self._tpos = (self._tpos + 1) % self._plen
+            t = self._table
+            return t[i], t[i + 1], t[i + 2]
+        if self._pos >= self._len:
+            self._advance()
+        i = self._pos * 3
+        self._pos += 1
+        s = self.stripe
+        return s[i], s[i + 1], s[i + 2]
+
+    def fill_into(self, buf, offset, count, order=RGB_ORDER, bpp=3):
+        if bpp != 3:
+            return super().fill_into(buf, offset, count, order, bpp)
+        if self._key:
+            if self._torder != order:
+                self._otable = self._period_table(order)
+                self._torder = order
+            mv = memoryview(self._otable)
+            plen = self._plen
+            while count > 0:
+                k = min(count, plen - self._tpos)
+                buf[offset:offset + k * 3] = mv[self._tpos * 3:(self._tpos + k) * 3]
+                self._tpos = (self._tpos + k) % plen
+                offset += k * 3
+                count -= k
+            return
+        while count > 0:
+            if self._pos >= self._len:
+                self._advance()
+            if order[0] == 0 and order[1] == 1 and order[2] == 2:
+                src = self.stripe
+            else:
+                if self._order != order:
+                    # convert the stripe to strip byte order once, then copy it in runs
+                    s = self.stripe
+                    o = self._ordered
+                    for i in range(0, self._len * 3, 3):
+                        o[i + order[0]] = s[i]
+                        o[i + order[1]] = s[i + 1]
+                        o[i + order[2]] = s[i + 2]
+                    self._order = order
+                src = self._ordered
+            k = min(count, self._len - self._pos)
+            buf[offset:offset + k * 3] = memoryview(src)[self._pos * 3:(self._pos + k) * 3]
+            self._pos += k
+            offset += k * 3
+            count -= k
+
+
+class SteppedColorWheel(StripeGenerator):
+    def __init__(self, hue_stride=10, stripe_size=20, start_hue=0):
+        """
+        Generator that cycles through the color wheel creating stripes that fade to
+        a slightly different hue.
+
+        :param hue_stride: Number of steps on the color wheel to skip, negative will go in reverse.
+        :param stripe_size: Size of fading stripe
+        :param start_hue: Starting hue on color wheel
+        """
+        super().__init__(stripe_size)
+        self.hue_stride = hue_stride or 1
+        self.hue = start_hue
+        self._set_period()
+
+    def next_stripe(self):
+        c1 = trickLED.color_wheel(self.hue, FULL)
+        c2 = trickLED.color_wheel((self.hue + self.hue_stride) % 255, FULL >> 2)
+        steps = self._len - 1
+        inc = trickLED.step_inc(c1, c2, steps) if steps else (0, 0, 0)
+        s = self.stripe
+        add8 = trickLED.add8
+        for i in range(self._len):
+            j = i * 3
+            s[j] = add8(c1[0], inc[0] * i)
+            s[j + 1] = add8(c1[1], inc[1] * i)
+            s[j + 2] = add8(c1[2], inc[2] * i)
+        self.hue = (self.hue + self.hue_stride) % 255
+
+
+class StripedColorWheel(StripeGenerator):
+    def __init__(self, hue_stride=10, stripe_size=10, start_hue=0):
+        """
+        Generator that cycles through the color wheel creating stripes of the same color before moving to next hue.
+
+        :param hue_stride: Number of steps on the color wheel to skip, negative will go in reverse.
+        :param stripe_size: Number of times to repeat each color
+        :param start_hue: Starting hue on color wheel
+        """
+        super().__init__(stripe_size)
+        self.hue_stride = hue_stride or 1
+        self.hue = start_hue
+        self._set_period()
+
+    def next_stripe(self):
+        col = trickLED.color_wheel(self.hue, FULL)
+        bufops.fill_pattern(self.stripe, bytes(col))
+        self.hue = (self.hue + self.hue_stride) % 255
+
+
+class FadingColorWheel(StripeGenerator):
+    def __init__(self, hue_stride=10, stripe_size=20, start_hue=0, mode=trickLED.FADE_OUT):
+        """
+        Cycle through color wheel while fading in and out before moving to next hue.
+
+        :param hue_stride: Number of steps on the color wheel to skip. Negative will go in reverse
+        :param strip_size: Length of the fade in, fade out cycle where hue remains the same
+        :param start_hue: Location on color wheel to begin
+        :param mode: Fade in, fade out, fade in then out
+        """
+        if stripe_size <= 1:
+            raise ValueError('stripe_size must be > 1 to fade')
+        super().__init__(stripe_size)
+        # calculate brightness values
+        if mode == trickLED.FADE_IN_OUT:
+            cs = 127.5 / (stripe_size - 1)
             co = 0
-        bv = [255 - int(trickLED.sin8(co + i * cs) * 253) for i in range(stripe_size)]
-    if hue_stride == 0:
-        hue_stride = 1
-    while True:
-        for i in range(stripe_size):
-            yield trickLED.color_wheel(hue, bv[i])
-        hue = (hue + hue_stride) % 255
+            self.levels = [2 + int(trickLED.sin8(co + i * cs) * 253) for i in range(stripe_size)]
+        else:
+            if mode == trickLED.FADE_IN:
+                cs = 63.75 / (stripe_size - 1)
+                co = 63.75
+            else:
+                cs = 63.75 / (stripe_size - 1)
+                co = 0
+            self.levels = [255 - int(trickLED.sin8(co + i * cs) * 253) for i in range(stripe_size)]
+        self.hue_stride = hue_stride or 1
+        self.hue = trickLED.uint8(start_hue) % 255
+        self._set_period(mode)
 
+    def next_stripe(self):
+        wheel = colortable.wheel
+        s = self.stripe
+        i = self.hue * 3
+        j = 0
+        for b in self.levels:
+            tbl = wheel(b)
+            s[j] = tbl[i]
+            s[j + 1] = tbl[i + 1]
+            s[j + 2] = tbl[i + 2]
+            j += 3
+        self.hue = (self.hue + self.hue_stride) % 255
 
-def color_compliment(hue_stride=10, stripe_size=1, start_hue=0):
-    """
-    Step through color wheel alternating between a color and its compliment
 
-    :param hue_stride:
-    :param stripe_size: Number of times to repeat each color
-    :param start_hue: Location on color wheel to begin
-    :return color generator
-    """
-    hue = start_hue
-    while True:
-        col = trickLED.color_wheel(hue, trickLED.global_setings.get('brightness'))
-        for i in range(stripe_size):
-            yield col
-        col = trickLED.color_wheel((hue + 127) % 255, trickLED.global_setings.get('brightness'))
-        for i in range(stripe_size):
-            yield col
-        hue = (hue + hue_stride) % 255
-
-
-def random_vivid():
+class ColorCompliment(StripeGenerator):
+    def __init__(self, hue_stride=10, stripe_size=1, start_hue=0):
+        """
+        Step through color wheel alternating between a color and its compliment
+
+        :param hue_stride:
+        :param stripe_size: Number of times to repeat each color
+        :param start_hue: Location on color wheel to begin
+        """
+        # one stripe holds the color followed by its compliment
+        super().__init__(stripe_size * 2)
+        self.hue_stride = hue_stride
+        self.hue = start_hue
+        self._set_period()
+
+    def next_stripe(self):
+        half = self._len // 2 * 3
+        mv = memoryview(self.stripe)
+        bufops.fill_pattern(mv[:half], bytes(trickLED.color_wheel(self.hue, FULL)))
+        bufops.fill_pattern(mv[half:], bytes(trickLED.color_wheel((self.hue + 127) % 255, FULL)))
+        self.hue = (self.hue + self.hue_stride) % 255
+
+
+class RandomVivid(ColorGenerator):
     """
     Generate random vivid colors by filling only 2 channels.
-    :return: color generator
-    """
-    shifts = ((16, 8),  # (p, s, 0)  red-yellow-green
-              (8, 0),   # (0, p, s)  green-aqua-blue
-              (0, 16))  # (s, 0, p)  blue-purple-red
-    while True:
-        brightness = trickLED.global_setings.get('brightness')
-        cov = randrange(0, 2)
-        prime = randrange(1, brightness)
-        second = brightness - prime
-        s = shifts[cov]
-        val = prime << s[0] | second << s[1]
-        yield tuple(val.to_bytes(3, 'big'))
-
-
-def random_pastel(bpp=3, mask=None):
     """
-    Generate random pastel colors.
+    # (prime, second, off) channel of each color range
+    channels = ((0, 1, 2),  # (p, s, 0)  red-yellow-green
+                (1, 2, 0),  # (0, p, s)  green-aqua-blue
+                (2, 0, 1))  # (s, 0, p)  blue-purple-red
 
-    :param bpp: Bytes per pixel
-    :param mask: Bit masks to control hue. (255, 0, 63) would give red to purple colors.
-    :return: color generator
-    """
-    mi = 0
-    bc = bpp * 8
-    if mask:
-        if bpp != len(mask):
-            raise ValueError('The mask must contain the same number of items as bytes to be returned.')
-        for i in range(bpp):
-            mi = (mi << 8) | mask[i]
-    else:
-        mi = 2 ** bc - 1
-    while True:
-        val = getrandbits(bc) & mi
-        yield tuple(val.to_bytes(bpp, 'big'))
+    def __init__(self, rng=None):
+        """
+        :param rng: prng.Xorshift to draw from, defaults to the shared prng.rng
+        """
+        self.rng = rng or prng.rng
+        # two random bytes per color, the range and the prime channel value
+        self._rand = bytearray(0)
+        self._order = None
+        self._ordered = None
+
+    def __next__(self):
+        val = self.rng.next16()
+        ch = self.channels[((val & 255) * 3) >> 8]
+        prime = 1 + (((val >> 8) * 254) >> 8)
+        col = [0, 0, 0]
+        col[ch[0]] = prime
+        col[ch[1]] = FULL - prime
+        return tuple(col)
+
+    def fill_into(self, buf, offset, count, order=RGB_ORDER, bpp=3):
+        if bpp < 3:
+            return super().fill_into(buf, offset, count, order, bpp)
+        if self._order != order:
+            self._ordered = tuple((order[c[0]], order[c[1]], order[c[2]]) for c in self.channels)
+            self._order = order
+        ordered = self._ordered
+        if len(self._rand) < count * 2:
+            self._rand = bytearray(count * 2)
+        rand = self.rng.fill(self._rand, 0, count * 2)
+        k = 0
+        for j in range(offset, offset + count * bpp, bpp):
+            ch = ordered[(rand[k] * 3) >> 8]
+            prime = 1 + ((rand[k + 1] * 254) >> 8)
+            buf[j + ch[0]] = prime
+            buf[j + ch[1]] = FULL - prime
+            buf[j + ch[2]] = 0
+            k += 2
+        if bpp > 3:
+            # clear the white byte
+            for j in range(offset + order[3], offset + count * bpp, bpp):
+                buf[j] = 0
+
+
+class RandomPastel(ColorGenerator):
+    def __init__(self, bpp=3, mask=None, rng=None):
+        """
+        Generate random pastel colors.
+
+        :param bpp: Bytes per pixel
+        :param mask: Bit masks to control hue. (255, 0, 63) would give red to purple colors.
+        :param rng: prng.Xorshift to draw from, defaults to the shared prng.rng
+        """
+        mi = 0
+        if mask:
+            if bpp != len(mask):
+                raise ValueError('The mask must contain the same number of items as bytes to be returned.')
+            for i in range(bpp):
+                mi = (mi << 8) | mask[i]
+        else:
+            mi = 2 ** (bpp * 8) - 1
+        self.bpp = bpp
+        self.mask = mi
+        self.rng = rng or prng.rng
+        # mask of each channel, channels with a full mask are used as drawn
+        self._masks = tuple(mi.to_bytes(bpp, 'big'))
+        self._rand = bytearray(bpp)
+
+    def __next__(self):
+        m = self._masks
+        if self.bpp == 3:
+            a = self.rng.next16()
+            b = self.rng.next16()
+            return a & m[0], (a >> 8) & m[1], b & m[2]
+        rand = self.rng.fill(self._rand, 0, self.bpp)
+        return tuple(rand[c] & m[c] for c in range(self.bpp))
+
+    def fill_into(self, buf, offset, count, order=RGB_ORDER, bpp=3):
+        end = offset + count * bpp
+        masks = self._masks
+        if bpp == self.bpp:
+            # every byte is drawn independently, so random bytes can go straight into strip order
+            self.rng.fill(buf, offset, end)
+            for c in range(bpp):
+                m = masks[c]
+                if m != 255:
+                    for i in range(offset + order[c], end, bpp):
+                        buf[i] &= m
+            return
+        sbpp = self.bpp
+        if len(self._rand) < count * sbpp:
+            self._rand = bytearray(count * sbpp)
+        rand = self.rng.fill(self._rand, 0, count * sbpp)
+        n = min(bpp, sbpp)
+        k = 0
+        for j in range(offset, end, bpp):
+            for c in range(n):
+                buf[j + order[c]] = rand[k + c] & masks[c]
+            for c in range(n, bpp):
+                buf[j + order[c]] = 0
+            k += sbpp
+
+
+# the generators were originally written as generator functions, keep those names
+stepped_color_wheel = SteppedColorWheel
+striped_color_wheel = StripedColorWheel
+fading_color_wheel = FadingColorWheel
+color_compliment = ColorCompliment
+random_vivid = RandomVivid
+random_pastel = RandomPastel
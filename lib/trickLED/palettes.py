@@ -0,0 +1,107 @@
+"""
+Gradient palettes. A palette is defined by a few stops, (index 0-255, color), and expanded once to n colors
+by interpolating between the stops. Expansions are kept in an LRU cache, so effects that use the same
+palette don't expand it again.
+"""
+from . import trickLED
+from . import bufops
+from .cache import LRUCache
+
+# gradient stops of the named palettes, index 0-255 and 0xRRGGBB color
+PALETTES = {
+    'rainbow': ((0, 0xff0000), (42, 0xffff00), (85, 0x00ff00), (127, 0x00ffff), (170, 0x0000ff),
+                (212, 0xff00ff), (255, 0xff0000)),
+    'heat': ((0, 0x000000), (85, 0xff0000), (170, 0xffff00), (255, 0xffffff)),
+    'lava': ((0, 0x000000), (46, 0x120000), (96, 0x710000), (108, 0x8e0300), (119, 0xaf1100),
+             (146, 0xd52c00), (174, 0xff5200), (188, 0xff7300), (202, 0xff9c00), (218, 0xffcb00),
+             (234, 0xffff00), (255, 0xffffff)),
+    'ocean': ((0, 0x000040), (64, 0x0000ff), (128, 0x0080ff), (192, 0x00ffc0), (255, 0xffffff)),
+    'forest': ((0, 0x003000), (96, 0x208000), (160, 0x80c000), (224, 0x406000), (255, 0x003000)),
+    'sunset': ((0, 0x780000), (22, 0xb31600), (51, 0xff6800), (85, 0xa71661), (135, 0x640067),
+               (198, 0x1000a0), (255, 0x000040)),
+    'party': ((0, 0x5500ab), (32, 0x84007c), (64, 0xb5004b), (96, 0xe5001b), (128, 0xe81700),
+              (160, 0xb84700), (192, 0xab7700), (224, 0xabab00), (255, 0x5500ab)),
+}
+
+# expanded palettes keyed by (stops, n, order), 256 RGB colors are 768 bytes
+expansions = LRUCache(8 * 768)
+
+
+def names():
+    """ Names of the palettes in PALETTES """
+    return sorted(PALETTES)
+
+
+def _stops(stops, bpi):
+    """ Return the stops as a hashable tuple of (index, color bytes) sorted by index """
+    if isinstance(stops, str):
+        try:
+            stops = PALETTES[stops]
+        except KeyError:
+            raise ValueError('No palette named {}'.format(stops))
+    if not stops:
+        raise ValueError('A palette needs at least one stop')
+    return tuple(sorted((min(max(int(i), 0), 255), tuple(trickLED.colval(c, bpi))) for i, c in stops))
+
+
+def expand(stops, n=256, bpi=3, order=None):
+    """
+    Return the palette expanded to n colors as packed bytes. The result is cached, treat it as read only.
+
+    :param stops: Palette name or sequence of (index 0-255, color) gradient stops
+    :param n: Number of colors
+    :param bpi: Bytes per color
+    :param order: Byte order of the colors, e.g. TrickLED.ORDER to get bytes that can be copied straight to
+                  the strip. Defaults to RGB like the palettes used by the animations.
+    """
+    stops = _stops(stops, bpi)
+    if order is not None:
+        order = tuple(order[:bpi])
+        if order == tuple(range(bpi)):
+            order = None
+    key = (stops, n, bpi, order)
+    buf = expansions.get(key)
+    if buf is not None:
+        return buf
+    if n != 256:
+        # other sizes sample the 256 color expansion at the nearest index
+        full = expand(stops, 256, bpi, order)
+        buf = bytearray(n * bpi)
+        last = max(n - 1, 1)
+        for k in range(n):
+            j = (k * 255 + last // 2) // last * bpi
+            buf[k * bpi:(k + 1) * bpi] = full[j:j + bpi]
+        return expansions.put(key, bytes(buf))
+    buf = bytearray(256 * bpi)
+    px = []
+    for i, col in stops:
+        if order is not None:
+            ordered = bytearray(bpi)
+            for c in range(bpi):
+                ordered[order[c]] = col[c]
+            col = ordered
+        px.append((i, bytes(col)))
+    # solid before the first stop and after the last, gradients in between
+    bufops.fill_pattern(buf, px[0][1], 0, px[0][0] * bpi)
+    for k in range(len(px) - 1):
+        a, ca = px[k]
+        b, cb = px[k + 1]
+        if b > a:
+            bufops.fill_gradient(buf, ca, cb, a * bpi, b - a, bpi)
+    bufops.fill_pattern(buf, px[-1][1], px[-1][0] * bpi)
+    return expansions.put(key, bytes(buf))
+
+
+def get(stops, n=256, bpi=3):
+    """
+    Return the palette as a ByteMap of n RGB colors for AnimationBase.palette. The ByteMap has its own
+    copy of the cached colors because animations scroll and refill their palettes.
+
+    :param stops: Palette name or sequence of (index 0-255, color) gradient stops
+    :param n: Number of colors
+    :param bpi: Bytes per color
+    """
+    pal = trickLED.ByteMap(0, bpi)
+    pal.buf = bytearray(expand(stops, n, bpi))
+    pal.n = n
+    return pal
@@ -0,0 +1,99 @@
+"""
+Small fast pseudo random number generator for animations. It is an xorshift generator on a pair of 16 bit
+words, so every intermediate value stays a small int on MicroPython and drawing numbers does not allocate.
+The period is 2**32 - 1.
+
+Numbers are drawn 16 bits at a time, fill() writes a whole buffer of random bytes per call and bounded
+values are scaled with a multiply and shift instead of retrying until a value is in range.
+"""
+from random import getrandbits
+
+
+class Xorshift:
+    """ xorshift generator with two 16 bit words of state, shifts (5, 3, 1). """
+    def __init__(self, seed=None):
+        """
+        :param seed: int seed, the same seed always produces the same numbers. If None it is seeded from
+                     the random module.
+        """
+        self.x = 0
+        self.y = 0
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        """ Restart the sequence from seed. """
+        if seed is None:
+            seed = getrandbits(32)
+        # scramble the seed (murmur3 finalizer) so small seeds like 1, 2, 3 do not start with near zero state
+        seed &= 0xffffffff
+        seed ^= seed >> 16
+        seed = (seed * 0x85ebca6b) & 0xffffffff
+        seed ^= seed >> 13
+        seed = (seed * 0xc2b2ae35) & 0xffffffff
+        seed ^= seed >> 16
+        if seed == 0:
+            # all zero state never changes
+            seed = 0x9e3779b9
+        self.x = seed >> 16
+        self.y = seed & 0xffff
+
+    def next16(self):
+        """ Return a random int in range(65536). """
+        t = self.x
+        t ^= (t << 5) & 0xffff
+        self.x = y = self.y
+        self.y = y = y ^ (y >> 1) ^ t ^ (t >> 3)
+        return y
+
+    def getrandbits(self, k):
+        """ Return an int with k random bits. """
+        if k <= 16:
+            return self.next16() >> (16 - k)
+        val = 0
+        while k > 0:
+            val = (val << 16) | self.next16()
+            k -= 16
+        return val >> -k
+
+    def below(self, n):
+        """ Return a random int in range(n). Slightly biased for large n, never loops. """
+        if n <= 0x4000:
+            return (self.next16() * n) >> 16
+        return (((self.next16() << 16) | self.next16()) * n) >> 32
+
+    def randrange(self, low, high):
+        """ Return a random int in range(low, high). """
+        return low + self.below(high - low)
+
+    def fill(self, buf, start=0, end=None):
+        """ Fill buf[start:end] with random bytes. """
+        if end is None:
+            end = len(buf)
+        x = self.x
+        y = self.y
+        i = start
+        last = end - 1
+        while i < end:
+            t = x ^ ((x << 5) & 0xffff)
+            x = y
+            y = y ^ (y >> 1) ^ t ^ (t >> 3)
+            buf[i] = y & 255
+            if i < last:
+                buf[i + 1] = y >> 8
+            i += 2
+        self.x = x
+        self.y = y
+        return buf
+
+    def randbytes(self, n):
+        """ Return a new bytearray of n random bytes. """
+        return self.fill(bytearray(n))
+
+
+# shared generator used by animations and generators when they are not given their own
+rng = Xorshift()
+
+
+def seed(val=None):
+    """ Reseed the shared generator. """
+    rng.seed(val)
@@ -1,10 +1,15 @@
 import math
 import struct
 
-from random import getrandbits
+from array import array
+
 from neopixel import NeoPixel
 from micropython import const
 
+from . import bufops
+from . import colortable
+from . import prng
+
 BITS_LOW = const(15)             # 00001111
 BITS_MID = const(60)             # 00111100
 BITS_HIGH = const(240)           # 11110000
@@ -18,6 +23,16 @@ FADE_OUT = const(2)
 FADE_IN_OUT = const(3)
 FILL_MODE_MULTI = const(4)
 FILL_MODE_SOLID = const(5)
+# blend modes of TrickSegment layers
+BLEND_COPY = bufops.BLEND_COPY
+BLEND_ADD = bufops.BLEND_ADD
+BLEND_SCREEN = bufops.BLEND_SCREEN
+BLEND_MAX = bufops.BLEND_MAX
+BLEND_ALPHA = bufops.BLEND_ALPHA
+# byte position of each channel when colors are stored in RGB order
+RGB_ORDER = (0, 1, 2, 3)
+# number of set bits in each byte value
+POPCOUNT = bytes(bin(i).count('1') for i in range(256))
 
 global_setings = {
     'brightness': 100,
@@ -86,17 +101,13 @@ def cos8(v):
 
 def color_wheel(hue, val=255):
     """ 255 degree color wheel. HSV but all at full saturation. """
-    hue = uint8(hue) % 255
-    pa = hue % 85
-    ss = val / 85
-    ci = uint8(ss * pa)
-    cd = uint8(val) - ci
-    if hue < 85:
-        return cd, ci, 0
-    elif hue < 170:
-        return 0, cd, ci
-    else:
-        return ci, 0, cd
+    if not 0 <= hue < 255:
+        hue = uint8(hue) % 255
+    if not 0 <= val <= 255:
+        val = uint8(val)
+    i = int(hue) * 3
+    tbl = colortable.wheel(int(val))
+    return tbl[i], tbl[i + 1], tbl[i + 2]
 
 
 def heat_color(temp):
@@ -112,49 +123,43 @@ def heat_color(temp):
         return 255, 255, heat_ramp
 
 
-def rand32(pct):
-    """ Return a random 32 bit int with approximate percentage of ones."""
-    # grb = random.getrandbits() ~ 50% 1's
-    grb = getrandbits
+def rand16(pct, rng=None):
+    """ Return a random 16 bit int with approximate percentage of ones."""
+    # each draw is ~ 50% 1's, and-ing or or-ing draws moves that toward 0% or 100%
+    grb = (rng or prng.rng).next16
     if pct < 1:
         return 0
     elif pct <= 6:
-        return grb(32) & grb(32) & grb(32) & grb(32)
+        return grb() & grb() & grb() & grb()
     elif pct <= 19:
-        return grb(32) & grb(32) & grb(32)
+        return grb() & grb() & grb()
     elif pct <= 31:
-        return grb(32) & grb(32)
+        return grb() & grb()
     elif pct <= 44:
-        return grb(32) & (grb(32) | grb(32))
+        return grb() & (grb() | grb())
     elif pct <= 56:
-        return grb(32)
+        return grb()
     elif pct <= 69:
-        return grb(32) | (grb(32) & grb(32))
+        return grb() | (grb() & grb())
     elif pct <= 81:
-        return grb(32) | grb(32)
+        return grb() | grb()
     elif pct <= 94:
-        return grb(32) | grb(32) | grb(32)
+        return grb() | grb() | grb()
     elif pct >= 100:
-        return 2 ** 32 - 1
+        return 0xffff
     else:
-        return grb(32) | grb(32) | grb(32) | grb(32)
+        return grb() | grb() | grb() | grb()
+
+
+def rand32(pct):
+    """ Return a random 32 bit int with approximate percentage of ones."""
+    return (rand16(pct) << 16) | rand16(pct)
 
 
 def randrange(low, high):
-    # esp8266 port doesn't have randrange (or bit_length)
-    d = high - low
-    bl = len(bin(d)) - 2
-    rn = getrandbits(bl) + low
-    if low <= rn <= high:
-        return rn
-    rv = rn & high
-    if low <= rv <= high:
-        return rv
-    rv = rn | low 
-    if low <= rv <= high:
-        return rv
-    return high
-      
+    """ Return a random int in range(low, high), the esp8266 port doesn't have random.randrange """
+    return prng.rng.randrange(low, high)
+
 
 def colval(val, bpp=3):
     """ allow the input of color values as ints (including hex) and None/0 for black """
@@ -177,6 +182,7 @@ def shift_bits(val, shift):
 class BitMap:
     """ Helper class to keep track of metadata about our pixels as a bit in a bytearray
         The values automatically wrap around instead of throwing an index error.
+        Bulk operations (rotation, counting, masks) work on the whole map as one integer instead of bit by bit.
     """
     def __init__(self, n, pct=50):
         self.n = n
@@ -191,16 +197,15 @@ class BitMap:
     def bit(self, idx, val=None):
         """ Get or set a single bit """
         if self._po:
-            idx = (idx + self._po) % self.n 
-        byte_idx = idx // 8
-        bit_idx = idx % 8
-        mask = 1 << bit_idx
+            idx = (idx + self._po) % self.n
+        byte_idx = idx >> 3
+        bit_idx = idx & 7
         if val is None:
-            return (self.buf[byte_idx] & mask) >> bit_idx
+            return (self.buf[byte_idx] >> bit_idx) & 1
         if val == 0:
-            self.buf[byte_idx] &= ~mask
+            self.buf[byte_idx] &= ~(1 << bit_idx)
         elif val == 1:
-            self.buf[byte_idx] |= mask
+            self.buf[byte_idx] |= 1 << bit_idx
 
     def __getitem__(self, i):
         if 0 <= i < self.n:
@@ -215,18 +220,119 @@ class BitMap:
         else:
             raise IndexError('index out of range')
 
+    def _to_int(self):
+        """ Return the first n bits as an int, bit i of the int is physical bit i """
+        return int.from_bytes(self.buf, 'little') & ((1 << self.n) - 1)
+
+    def _from_int(self, val):
+        self.buf[:] = val.to_bytes(self.wc * 4, 'little')
+
+    def _normalize(self):
+        """ Rotate the bits so the scroll offset is 0. """
+        if self._po:
+            n = self.n
+            po = self._po
+            v = self._to_int()
+            self._from_int((v >> po) | ((v << (n - po)) & ((1 << n) - 1)))
+            self._po = 0
+
     def scroll(self, steps):
         self._po = (self._po - steps) % self.n
-                  
-    def randomize(self, pct=None):
-        """ fill buffer with random 1s and 0s. Use pct to control the approx percent of 1s """
+
+    def count(self):
+        """ Return the number of set bits """
+        cnt = 0
+        buf = self.buf
+        nb = self.n >> 3
+        for i in range(nb):
+            cnt += POPCOUNT[buf[i]]
+        if self.n & 7:
+            cnt += POPCOUNT[buf[nb] & ((1 << (self.n & 7)) - 1)]
+        return cnt
+
+    def _span(self, lo, hi, val):
+        # yield physical indexes lo <= i < hi where bit == val, skipping whole bytes that can't match
+        buf = self.buf
+        skip = 0 if val else 255
+        i = lo
+        while i < hi:
+            b = buf[i >> 3]
+            if i & 7 == 0 and b == skip and i + 8 <= hi:
+                i += 8
+                continue
+            if (b >> (i & 7)) & 1 == val:
+                yield i
+            i += 1
+
+    def iter_bits(self, val=1, stop=None):
+        """ Iterate over the logical indexes below stop of the bits equal to val, in increasing order """
+        po = self._po
+        n = self.n
+        if stop is None or stop > n:
+            stop = n
+        for i in self._span(po, min(po + stop, n), val):
+            yield i - po
+        if po + stop > n:
+            for i in self._span(0, po + stop - n, val):
+                yield i + n - po
+
+    def runs(self, val=1, stop=None):
+        """ Iterate over (start, end) ranges of consecutive bits equal to val, end is exclusive """
+        start = -1
+        last = -2
+        for i in self.iter_bits(val, stop):
+            if i != last + 1:
+                if start >= 0:
+                    yield start, last + 1
+                start = i
+            last = i
+        if start >= 0:
+            yield start, last + 1
+
+    def _combine(self, other, op):
+        if other.n != self.n:
+            raise ValueError('BitMaps must be the same size')
+        self._normalize()
+        other._normalize()
+        a = self._to_int()
+        b = other._to_int()
+        if op == 0:
+            v = a & b
+        elif op == 1:
+            v = a | b
+        else:
+            v = a ^ b
+        self._from_int(v)
+
+    def bit_and(self, other):
+        """ Keep only the bits that are also set in other """
+        self._combine(other, 0)
+
+    def bit_or(self, other):
+        """ Set the bits that are set in other """
+        self._combine(other, 1)
+
+    def bit_xor(self, other):
+        """ Toggle the bits that are set in other """
+        self._combine(other, 2)
+
+    def invert(self):
+        """ Flip every bit """
+        self._from_int(self._to_int() ^ ((1 << self.n) - 1))
+
+    def randomize(self, pct=None, rng=None):
+        """ fill buffer with random 1s and 0s. Use pct to control the approx percent of 1s and rng to draw
+            from a seeded prng.Xorshift instead of the shared one """
         self._po = 0
         if pct is None:
             pct = self.pct
-        buf = bytearray()
-        for i in range(self.wc):
-            buf += struct.pack('I', rand32(pct))
-        self.buf = buf
+        rng = rng or prng.rng
+        buf = self.buf
+        # 16 bits at a time so the values stay small ints and nothing is allocated
+        for i in range(0, self.wc * 4, 2):
+            v = rand16(pct, rng)
+            buf[i] = v & 255
+            buf[i + 1] = v >> 8
 
     def repeat(self, val):
         """ fill buffer by repeating val """
@@ -234,24 +340,14 @@ class BitMap:
         if not isinstance(val, int) or val >= 1 << 32:
             raise ValueError('Value error must be int')
         if val < 256:
-            n = self.wc * 4
-            v = val
-            self.buf = bytearray([v] * n)
-            return
+            v = bytes((val,))
         elif val < 1 << 16:
-            n = self.wc * 2
             v = val.to_bytes(2, 'little')
         elif val < 1 << 24:
-            n = math.ceil(self.wc * 4 / 3)
             v = val.to_bytes(3, 'little')
         else:
-            n = self.wc
             v = struct.pack('I', val)
-
-        buf = bytearray()
-        for i in range(n):
-            buf += v
-        self.buf = buf[0:self.wc * 4]
+        bufops.fill_pattern(self.buf, v)
 
     def print(self):
         p = '{:4d} | {:08b} {:08b} {:08b} {:08b} | {:4d}'
@@ -277,13 +373,37 @@ class ByteMap:
         self.bpi = bpi
         self.buf = bytearray(n * bpi)
         self.order = order
+        # logical scroll offset, item i is stored at (i + _po) % n
+        self._po = 0
+        self._scratch = None
+        # set when items change, TrickLED.write() skips unchanged frames of an index plane with it
+        self._dirty = True
+
+    def _normalize(self):
+        """ Apply the scroll offset to the buffer so items are stored in logical order. """
+        if self._po:
+            end = self.n * self.bpi
+            if self._scratch is None or len(self._scratch) != end:
+                self._scratch = bytearray(end)
+            bufops.rotate_into(self._scratch, self.buf, self._po * self.bpi, end)
+            self.buf[0:end] = self._scratch
+            self._po = 0
+
+    def normalize(self):
+        """ Apply a pending scroll offset, so item i is at self.buf[i * bpi]. Call before working on
+            self.buf directly. """
+        self._normalize()
 
     def __setitem__(self, key, value):
         value = bytes(colval(value, self.bpi))
-        idx = key * self.bpi
+        self._dirty = True
         if 0 <= key < self.n:
+            if self._po:
+                key = (key + self._po) % self.n
+            idx = key * self.bpi
             self.buf[idx:idx + self.bpi] = value
         elif key == self.n:
+            self._normalize()
             self.buf += value
             self.n += 1
         else:
@@ -291,17 +411,19 @@ class ByteMap:
 
     def __getitem__(self, key):
         if isinstance(key, int):
-            if 0 <= key < self.n:
-                si = key * self.bpi
-            elif -self.n < key < 0:
-                si = (key + self.n) * self.bpi
-            else:
+            if -self.n < key < 0:
+                key += self.n
+            elif not 0 <= key < self.n:
                 raise IndexError('index out of range')
+            if self._po:
+                key = (key + self._po) % self.n
+            si = key * self.bpi
             if self.bpi > 1:
                 return tuple(self.buf[si: si + self.bpi])
             else:
                 return self.buf[si]
         elif isinstance(key, slice):
+            self._normalize()
             si = (key.start if key.start else 0) * self.bpi
             ei = (key.stop if key.stop else self.n) * self.bpi
             if key.step and (key.step < -1 or key.step > 1):
@@ -312,79 +434,94 @@ class ByteMap:
 
     def get_ordered_item(self, key):
         # get item in proper order to write to led buffer
+        if self._po:
+            key = (key + self._po) % self.n
         si = key * self.bpi
         return bytearray(self.buf[si + i] for i in self.order)
 
     def __len__(self):
         return self.n
 
+    def mark_dirty(self):
+        """ Record a change made to self.buf directly """
+        self._dirty = True
+
+    def copy(self):
+        """ Return a copy of the map, including its scroll offset """
+        bm = ByteMap(0, self.bpi, self.order)
+        bm.n = self.n
+        bm.buf = self.buf[:]
+        bm._po = self._po
+        return bm
+
     def append(self, val):
+        self._normalize()
         self.buf.append(val)
         self.n += 1
+        self._dirty = True
 
     def extend(self, vals):
+        self._normalize()
         self.buf.extend(vals)
         self.n = len(self.buf) // self.bpi
+        self._dirty = True
+
+    def _apply(self, op, val, name):
+        if isinstance(val, (list, tuple)) and len(val) < self.bpi:
+            raise ValueError('Length of value to {} must match byte size.'.format(name))
+        bufops.apply_op(self.buf, op, val, self.n * self.bpi, self.bpi)
+        self._dirty = True
 
     def add(self, val):
-        if isinstance(val, (list, tuple)):
-            if len(val) < self.bpi:
-                raise ValueError('Length of value to add must match byte size.')
-            self.buf = bytearray([uint8(self.buf[i] + val[i % self.bpi]) for i in range(self.n * self.bpi)])
-        else:
-            self.buf = bytearray([uint8(v + val) for v in self.buf])
+        self._apply(bufops.OP_ADD, val, 'add')
 
     def sub(self, val):
-        if isinstance(val, (list, tuple)):
-            if len(val) < self.bpi:
-                raise ValueError('Length of value to sub must match byte size.')
-            self.buf = bytearray([uint8(self.buf[i] - val[i % self.bpi]) for i in range(self.n * self.bpi)])
-        else:
-            self.buf = bytearray([uint8(v - val) for v in self.buf])
+        self._apply(bufops.OP_SUB, val, 'sub')
 
     def mul(self, val):
-        if isinstance(val, (list, tuple)):
-            if len(val) < self.bpi:
-                raise ValueError('Length of value to multiply must match byte size.')
-            self.buf = bytearray([uint8(self.buf[i] * val[i % self.bpi]) for i in range(self.n * self.bpi)])
-        else:
-            self.buf = bytearray([uint8(v * val) for v in self.buf])
+        self._apply(bufops.OP_MUL, val, 'multiply')
 
     def div(self, val):
-        if isinstance(val, (list, tuple)):
-            if len(val) < self.bpi:
-                raise ValueError('Length of value to divide must match byte size.')
-            self.buf = bytearray([uint8(self.buf[i] // val[i % self.bpi]) for i in range(self.n * self.bpi)])
-        else:
-            self.buf = bytearray([uint8(v // val) for v in self.buf])
+        self._apply(bufops.OP_DIV, val, 'divide')
 
     def scroll(self, step=1):
-        cut = self.bpi * -step
-        self.buf = self.buf[cut:] + self.buf[:cut]
+        """ Scroll items by moving the logical offset, the buffer is not touched. """
+        if self.n:
+            self._po = (self._po - step) % self.n
+            self._dirty = True
 
     def fill(self, val, start_pos=0, end_pos=None):
-        val = colval(val, self.bpi)
         if end_pos is None or end_pos >= self.n:
             end_pos = self.n - 1
-        for i in range(start_pos, end_pos + 1):
-            self[i] = val
+        if start_pos == 0 and end_pos == self.n - 1:
+            # a solid fill of the whole map doesn't care about the scroll offset
+            self._po = 0
+        else:
+            self._normalize()
+        val = bytes(colval(val, self.bpi))
+        bufops.fill_pattern(self.buf, val, start_pos * self.bpi, (end_pos + 1) * self.bpi)
+        self._dirty = True
 
     def fill_gradient(self, v1, v2, start_pos=0, end_pos=None):
+        self._normalize()
         if end_pos is None or end_pos >= self.n:
             end_pos = self.n - 1
-        steps = end_pos - start_pos
         v1 = colval(v1, self.bpi)
         v2 = colval(v2, self.bpi)
-        inc = step_inc(v1, v2, steps)
-        for i in range(steps):
-            val = tuple(uint8(v1[n] + inc[n] * i) for n in range(self.bpi))
-            self[start_pos + i] = val
-        self[end_pos] = v2
+        bufops.fill_gradient(self.buf, v1, v2, start_pos * self.bpi, end_pos - start_pos, self.bpi)
+        self._dirty = True
 
     def fill_gen(self, gen, start_pos=0, end_pos=None, direction=1):
+        self._normalize()
         if end_pos is None or end_pos >= self.n:
             end_pos = self.n - 1
-        if direction > 0:
+        if hasattr(gen, 'fill_into'):
+            bpi = self.bpi
+            gen.fill_into(self.buf, start_pos * bpi, end_pos - start_pos + 1, RGB_ORDER, bpi)
+            if direction <= 0:
+                bufops.reverse_items(self.buf, start_pos * bpi, (end_pos + 1) * bpi, bpi)
+            self._dirty = True
+        elif direction > 0:
             for i in range(start_pos, end_pos + 1):
                 self[i] = next(gen)
         else:
@@ -394,42 +531,160 @@ class ByteMap:
 
 class TrickLED(NeoPixel):
     """ NeoPixels with benefits to aid in creating animations.
+
+    Animations draw into self.buf, the back buffer. write() composes the back buffer into a second
+    preallocated front buffer (applying the scroll offset and repeat_n) and sends that, so the frame
+    being sent is never touched by drawing and the back buffer keeps its state between frames.
+
+    In indexed color mode (see set_palette) the back buffer is replaced by self.index, one palette index
+    per pixel, and write() expands the indexes to colors in strip byte order. The methods that draw colors
+    raise a ValueError in that mode, draw indexes into self.index instead.
     """
     # repeat section 0-n, 0-n, 0-n
     REPEAT_MODE_STRIPE = const(1)
     # repeat section alternating backward and forward 0-n, n-0, 0-n
     REPEAT_MODE_MIRROR = const(2)
 
-    def __init__(self, pin, n, repeat_n=None, repeat_mode=None, **kwargs):
+    def __init__(self, pin, n, repeat_n=None, repeat_mode=None, brightness=None, **kwargs):
         """
         :param pin: Data pin
         :param n: number of pixels
         :param repeat_n: If set, the first n pixels will be repeated across the rest of the strip 
         :param repeat_mode: Controls if section is repeated or mirrored (alternating between forward and reversed)
+        :param brightness: 0-255 brightness applied by write(), defaults to global_setings['brightness']
         :param kwargs: bpp, timing
         """
         super().__init__(pin, n, **kwargs)
+        # frame sent to the strip, composed from self.buf by write()
+        self._front = bytearray(len(self.buf))
         self.repeat_n = repeat_n
         self.repeat_mode = repeat_mode if repeat_mode else TrickLED.REPEAT_MODE_STRIPE
+        # logical scroll offset within the calculated section, pixel i is stored at (i + _po) % repeat_n
+        self._po = 0
+        self._scratch = None
+        # slice copies for repeat_n, rebuilt when (n, repeat_n, bpp, mode) changes
+        self._rkey = None
+        self._rplan = None
+        # set by methods that change the whole frame, write() skips the transmission while it is False
+        self._dirty = True
+        # logical pixel range start to end - 1 changed by methods that only touch part of the frame, see
+        # _touch(). write() only composes that range when nothing else changed.
+        self._dlo = 0
+        self._dhi = 0
+        # buffer and repeat settings of the last write, a change to either also needs a write
+        self._wkey = None
+        self._wbuf = None
+        self.skipped_writes = 0
+        # indexed color mode, see set_palette()
+        self.index = None
+        self.palette = None
+        self._palette_tables = None
+        # two sets of tables cycle_palette() rotates into in turn, allocated on its first call
+        self._palette_cycle = None
+        # brightness, gamma and white balance applied by write(), see set_correction()
+        self.brightness = 255
+        self.gamma = 1
+        self.white_balance = None
+        self._correction = None
+        self.set_correction(global_setings['brightness'] if brightness is None else brightness)
 
     def __setitem__(self, i, val):
+        if self.buf is None:
+            self._rgb()
         if 0 <= i < self.n:
+            self._touch(i, i + 1)
+            if self._po:
+                rn = self.repeat_n or self.n
+                if i < rn:
+                    i = (i + self._po) % rn
             val = colval(val, self.bpp)
             super().__setitem__(i, val)
         else:
             raise IndexError('Assignment index out of range')
 
+    def __getitem__(self, i):
+        if self.index is not None:
+            # color of the palette index, in RGB order
+            v = self.index[i]
+            tables = self._palette_tables
+            return tuple(tables[self.ORDER[c]][v] for c in range(self.bpp))
+        if self._po:
+            rn = self.repeat_n or self.n
+            if 0 <= i < rn:
+                i = (i + self._po) % rn
+        return super().__getitem__(i)
+
+    def _rgb(self):
+        """ Raise if the strip is in indexed color mode, colors drawn now would never be shown """
+        if self.index is not None:
+            raise ValueError('The strip is in indexed color mode, draw palette indexes into self.index')
+
+    def _touch(self, start, end):
+        """ Record that the logical pixels start to end - 1 changed """
+        if self._dlo < self._dhi:
+            if start < self._dlo:
+                self._dlo = start
+            if end > self._dhi:
+                self._dhi = end
+        else:
+            self._dlo = start
+            self._dhi = end
+
+    def _normalize(self):
+        """ Apply the scroll offset to the buffer so the calculated section is stored in logical order. """
+        if self._po:
+            end = (self.repeat_n or self.n) * self.bpp
+            if self._scratch is None or len(self._scratch) != end:
+                self._scratch = bytearray(end)
+            bufops.rotate_into(self._scratch, self.buf, self._po * self.bpp, end)
+            self.buf[0:end] = self._scratch
+            self._po = 0
+
+    def normalize(self):
+        """ Apply a pending scroll offset, so pixel i is at self.buf[i * bpp]. Call before working on
+            self.buf directly, and mark_dirty() after. """
+        self._normalize()
+
     def _rgb_to_order(self, col):
         """ Convert RGB value to byte order of LEDs """
         return [col[self.ORDER[i]] for i in range(self.bpp)]
 
+    def _pixel_bytes(self, color):
+        """ Convert a color to the bytes of a single pixel in strip byte order """
+        color = colval(color, self.bpp)
+        px = bytearray(self.bpp)
+        for i in range(self.bpp):
+            px[self.ORDER[i]] = color[i]
+        return px
+
     def scroll(self, step=1):
-        """ Scroll the pixels some number of steps in the given direction.
+        """ Scroll the pixels some number of steps in the given direction. Only the logical offset
+        moves, the pixels are rotated into place once when the strip is written.
 
         :param step: Number and direction to shift pixels
         """
-        cut = self.bpp * -step
-        self.buf = self.buf[cut:] + self.buf[:cut]
+        if self.index is not None:
+            self.index.scroll(step)
+            return
+        po = (self._po - step) % (self.repeat_n or self.n)
+        if po != self._po:
+            self._po = po
+            self._dirty = True
+
+    def clear(self):
+        """ Turn every pixel off. In indexed color mode every index is set to 0, the palette's first color
+            should be black. """
+        if self.index is not None:
+            self.index.fill(0)
+        else:
+            self.fill(0)
+
+    def fill(self, color):
+        """ Fill the entire strip with a single color """
+        self._rgb()
+        self._po = 0
+        bufops.fill_pattern(self.buf, self._pixel_bytes(color))
+        self._dirty = True
 
     def fill_solid(self, color, start_pos=0, end_pos=None):
         """
@@ -439,11 +694,17 @@ class TrickLED(NeoPixel):
         :param start_pos: Start position, defaults to beginning of strip
         :param end_pos: End position, defaults to end of strip
         """
-        color = colval(color, self.bpp)
+        self._rgb()
+        rn = self.repeat_n or self.n
         if end_pos is None or end_pos >= self.n:
-            end_pos = (self.repeat_n or self.n) - 1
-        for i in range(start_pos, end_pos + 1):
-            self[i] = color
+            end_pos = rn - 1
+        if start_pos == 0 and end_pos == rn - 1:
+            # a solid fill of the whole section doesn't care about the scroll offset
+            self._po = 0
+        else:
+            self._normalize()
+        bufops.fill_pattern(self.buf, self._pixel_bytes(color), start_pos * self.bpp, (end_pos + 1) * self.bpp)
+        self._touch(start_pos, end_pos + 1)
 
     def fill_gradient(self, col1, col2, start_pos=0, end_pos=None):
         """
@@ -454,16 +715,14 @@ class TrickLED(NeoPixel):
         :param start_pos: Start position, defaults to beginning of strip
         :param end_pos: End position, defaults to end of strip
         """
+        self._rgb()
+        self._normalize()
         if end_pos is None or end_pos >= self.n:
             end_pos = (self.repeat_n or self.n) - 1
-        steps = end_pos - start_pos
-        col1 = colval(col1, self.bpp)
-        col2 = colval(col2, self.bpp)
-        inc = step_inc(col1, col2, steps)
-        for i in range(steps):
-            col = tuple(uint8(col1[n] + inc[n] * i) for n in range(len(col1)))
-            self[start_pos + i] = col
-        self[end_pos] = col2
+        bpp = self.bpp
+        bufops.fill_gradient(self.buf, self._pixel_bytes(col1), self._pixel_bytes(col2),
+                             start_pos * bpp, end_pos - start_pos, bpp)
+        self._touch(start_pos, end_pos + 1)
 
     def fill_gen(self, gen, start_pos=0, end_pos=None, direction=1):
         """
@@ -471,11 +730,20 @@ class TrickLED(NeoPixel):
         :param gen: Color generator
         :param start_pos: Start position, defaults to beginning of strip
         :param end_pos: End position, defaults to end of strip
-        :param direction:
+        :param direction: 1 to fill forward, -1 to fill backward from end_pos
         """
+        self._rgb()
+        self._normalize()
         if end_pos is None or end_pos >= self.n:
             end_pos = (self.repeat_n or self.n) - 1
-        if direction > 0:
+        if hasattr(gen, 'fill_into'):
+            # block protocol: the generator writes straight into the buffer in strip byte order
+            bpp = self.bpp
+            gen.fill_into(self.buf, start_pos * bpp, end_pos - start_pos + 1, self.ORDER, bpp)
+            if direction <= 0:
+                bufops.reverse_items(self.buf, start_pos * bpp, (end_pos + 1) * bpp, bpp)
+            self._touch(start_pos, end_pos + 1)
+        elif direction > 0:
             for i in range(start_pos, end_pos + 1):
                 self[i] = next(gen)
         else:
@@ -491,135 +759,380 @@ class TrickLED(NeoPixel):
         :param start_pos: Start position, defaults to beginning of strip
         :param end_pos: End position
         """
-        color = colval(color, self.bpp)
-        last_col = (0,) * self.bpp
-        blend_col = (0,) * self.bpp
+        self._rgb()
+        if not 0 <= pct <= 100:
+            return
+        self._normalize()
         if end_pos is None:
             end_pos = (self.repeat_n or self.n) - 1
-        for i in range(start_pos, end_pos + 1):
-            if self[i] == blend_col:
-                continue
-            elif self[i] == last_col:
-                self[i] = blend_col
-            else:
-                last_col = self[i]
-                blend_col = blend(self[i], color, pct)
-                self[i] = blend_col
+        bpp = self.bpp
+        bufops.blend_range(self.buf, self._pixel_bytes(color), bufops.pct_to_alpha(pct),
+                           start_pos * bpp, (end_pos + 1) * bpp, bpp)
+        self._touch(start_pos, end_pos + 1)
 
-    def add(self, val):
+    def _apply(self, op, val, name):
+        """ Apply a saturating operation in place to the pixels that are calculated (the first repeat_n) """
+        self._rgb()
         bpp = self.bpp
-        mi = self.repeat_n or self.n
         if isinstance(val, (list, tuple)):
             if len(val) < bpp:
-                raise ValueError('Length of value to add must match bpp')
-            # convert RGB to string byte order
+                raise ValueError('Length of value to {} must match bpp'.format(name))
+            # convert RGB to strip byte order
             val = self._rgb_to_order(val)
-            self.buf = bytearray([uint8(self.buf[i] + val[i % bpp]) for i in range(mi * bpp)])
-        else:
-            self.buf = bytearray([uint8(self.buf[i] + val) for i in range(mi * bpp)])
+        bufops.apply_op(self.buf, op, val, (self.repeat_n or self.n) * bpp, bpp)
+        self._dirty = True
+
+    def add(self, val):
+        self._apply(bufops.OP_ADD, val, 'add')
 
     def sub(self, val):
-        bpp = self.bpp
-        mi = self.repeat_n or self.n
-        if isinstance(val, (list, tuple)):
-            if len(val) < bpp:
-                raise ValueError('Length of value to subtract must match bpp')
-            # convert RGB to string byte order
-            val = self._rgb_to_order(val)
-            self.buf = bytearray([uint8(self.buf[i] - val[i % bpp]) for i in range(mi * bpp)])
-        else:
-            self.buf = bytearray([uint8(self.buf[i] - val) for i in range(mi * bpp)])
+        self._apply(bufops.OP_SUB, val, 'subtract')
 
     def mul(self, val):
-        bpp = self.bpp
-        mi = self.repeat_n or self.n
-        if isinstance(val, (list, tuple)):
-            if len(val) < bpp:
-                raise ValueError('Length of value to multiply must match bpp')
-            # convert RGB to string byte order
-            val = self._rgb_to_order(val)
-            self.buf = bytearray([uint8(self.buf[i] * val[i % bpp]) for i in range(mi * bpp)])
-        else:
-            self.buf = bytearray([uint8(self.buf[i] * val) for i in range(mi * bpp)])
+        self._apply(bufops.OP_MUL, val, 'multiply')
 
     def div(self, val):
-        bpp = self.bpp
-        mi = self.repeat_n or self.n
-        if isinstance(val, (list, tuple)):
-            if len(val) < bpp:
-                raise ValueError('Length of value to multiply must match bpp')
-            # convert RGB to string byte order
-            val = self._rgb_to_order(val)
-            self.buf = bytearray([uint8(self.buf[i] / val[i % bpp]) for i in range(mi * bpp)])
-        else:
-            self.buf = bytearray([uint8(self.buf[i] / val) for i in range(mi * bpp)])
-
-    def _repeat_stripe(self, n=None):
+        self._apply(bufops.OP_DIV, val, 'divide')
+
+    def _repeat_plan(self, n, mirror):
+        """ Return the cached slice copies that repeat the first n pixels over the strip """
+        key = (self.n, n, self.bpp, mirror)
+        if self._rkey != key:
+            period = n * self.bpp
+            # a mirrored period is the section followed by its reverse
+            self._rplan = bufops.replicate_plan(period, self.n * self.bpp, period * 2 if mirror else period)
+            self._rkey = key
+        return self._rplan
+
+    def _repeat_stripe(self, n=None, buf=None):
         """
         Copy the first n pixels and repeat them over the rest of the strip
 
         :param n: Number of pixels to copy (not the zero-based index!)
+        :param buf: Buffer to expand, defaults to self.buf
         """
         if n is None:
             n = self.repeat_n
-        loc = jump = n * self.bpp
-        end = self.n * self.bpp
-        section = self.buf[0:jump]
-        while loc + jump <= end:
-            self.buf[loc:loc + jump] = section
-            loc += jump
-        if loc < end:
-            self.buf[loc:end] = section[:(end - loc)]
-
-    def _repeat_mirror(self, n=None):
+        bufops.replicate(self.buf if buf is None else buf, self._repeat_plan(n, False))
+
+    def _repeat_mirror(self, n=None, buf=None):
         """ Copy the first n pixels and repeat them alternating directions """
         if n is None:
             n = self.repeat_n
-        rl = n - 1
-        d = -1
-        setitem = super().__setitem__
-        for i in range(n, self.n):
-            setitem(i, self[rl])
-            if 0 < rl < n:
-                rl += 1 * d
-            elif rl == 0:
-                d = 1
+        if buf is None:
+            buf = self.buf
+        sl = n * self.bpp
+        end = self.n * self.bpp
+        if sl >= end:
+            return
+        if self._scratch is None or len(self._scratch) != sl:
+            self._scratch = bytearray(sl)
+        bufops.reverse_into(self._scratch, buf, sl, self.bpp)
+        k = min(sl, end - sl)
+        buf[sl:sl + k] = memoryview(self._scratch)[0:k]
+        bufops.replicate(buf, self._repeat_plan(n, True))
+
+    def set_palette(self, palette=None, tables=None):
+        """
+        Switch to indexed color mode. Animations then draw palette indexes into self.index, a ByteMap with
+        one byte per pixel of the calculated section, and write() maps them through the palette. The RGB
+        back buffer is released (self.buf is None), so drawing takes a third of the memory, and the methods
+        that draw colors raise a ValueError. Reading a pixel returns the palette color of its index. Call
+        again to change the palette, or without arguments to go back to drawing colors into self.buf.
+
+        :param palette: ByteMap or list of up to 256 colors
+        :param tables: Palette already expanded with bufops.expand_palette in strip byte order, used
+                       instead of palette
+        """
+        if palette is None and tables is None:
+            if self.index is not None:
+                self.index = None
+                self.palette = None
+                self._palette_tables = None
+                self.buf = bytearray(len(self._front))
+                self._dirty = True
+            return
+        if palette is not None:
+            if not isinstance(palette, ByteMap):
+                pal = ByteMap(0, self.bpp)
+                for col in palette:
+                    pal.extend(colval(col, self.bpp))
+                palette = pal
+            if palette.bpi != self.bpp:
+                raise ValueError('Palette colors must have {} bytes'.format(self.bpp))
+            self.palette = palette
+            palette._normalize()
+            tables = bufops.expand_palette(palette.buf, palette.n, palette.bpi, self.ORDER)
+        elif len(tables) != self.bpp:
+            raise ValueError('Palette needs one table per byte of a pixel')
+        elif tables is self._palette_tables:
+            # already in use
+            return
+        self._palette_tables = tables
+        if self.index is None:
+            self.index = ByteMap(self.repeat_n or self.n, 1)
+            # the front buffer is composed from the index, the RGB back buffer is no longer needed
+            self._po = 0
+            self.buf = None
+        self._dirty = True
+
+    def cycle_palette(self, step=1):
+        """
+        Rotate the colors of the palette by step entries. Only the palette tables are touched, not the pixels.
+        The tables are rotated into one of two sets kept by the strip, so cycling every frame does not
+        allocate, and the tables passed to set_palette() are left as they were. A palette set as tables
+        rotates all 256 index values.
+        """
+        tables = self._palette_tables
+        if tables is None:
+            raise ValueError('The strip is not in indexed color mode, see set_palette()')
+        pal = self.palette
+        if pal is not None:
+            # scroll only moves the offset of the ByteMap, it stays in step with the tables
+            pal.scroll(step)
+            n = pal.n
+        else:
+            n = 256
+        bpp = len(tables)
+        sets = self._palette_cycle
+        if sets is None or len(sets[0]) != bpp:
+            sets = self._palette_cycle = ([bytearray(256) for _ in range(bpp)],
+                                          [bytearray(256) for _ in range(bpp)])
+        dst = sets[1] if tables is sets[0] else sets[0]
+        shift = -step % n
+        for c in range(bpp):
+            t = dst[c]
+            bufops.rotate_into(t, tables[c], shift, n)
+            if n < 256:
+                # indexes past the end of the palette use its last color
+                bufops.fill_pattern(t, memoryview(t)[n - 1:n], n, 256)
+        self._palette_tables = dst
+        self._dirty = True
+
+    def set_correction(self, brightness=None, gamma=None, white_balance=None):
+        """
+        Set the brightness, gamma and white balance applied to every frame as it is written. They are
+        combined into one 256 byte table per channel, so a change costs nothing per pixel and shows on the
+        next write() without rebuilding the animation, its palettes or generators. Values not given are
+        kept.
+
+        :param brightness: 0-255
+        :param gamma: Gamma exponent, 1 is linear, around 2.2 makes fades look even to the eye
+        :param white_balance: Scale 0-255 per channel in RGB(W) order, e.g. (255, 210, 170) for a warmer white
+        """
+        if brightness is not None:
+            self.brightness = uint8(brightness)
+        if gamma is not None:
+            self.gamma = gamma
+        if white_balance is not None:
+            self.white_balance = white_balance
+        self._correction = bufops.correction_tables(self.brightness, self.gamma, self.white_balance,
+                                                    self.ORDER, self.bpp)
+        self._dirty = True
+
+    def mark_dirty(self, start_pos=None, end_pos=None):
+        """
+        Make the next write() send the strip. Call this after changing self.buf directly.
+
+        :param start_pos: First pixel that changed, the whole frame if not given
+        :param end_pos: Last pixel that changed, defaults to start_pos
+        """
+        if start_pos is None:
+            self._dirty = True
+        else:
+            self._touch(start_pos, (start_pos if end_pos is None else end_pos) + 1)
+
+    def write(self, force=False):
+        """
+        Compose the back buffer into the front buffer and send it. Nothing is done if no pixels changed
+        since the last write, those calls are counted in skipped_writes. If only a range of pixels changed
+        just that range is composed and repeated. The strip itself is always sent whole, a NeoPixel chain
+        has no way to update part of it.
+
+        :param force: Send the strip even if nothing changed
+        :return: True if the strip was sent
+        """
+        front = self._compose(force)
+        if front is None:
+            self.skipped_writes += 1
+            return False
+        self._send(front)
+        return True
+
+    def _compose(self, force=False):
+        """ Compose the back buffer into the front buffer, return None if nothing changed """
+        wkey = (self.repeat_n, self.repeat_mode)
+        back = self.buf
+        idx = self.index
+        if not (self._dirty or force or wkey != self._wkey or back is not self._wbuf):
+            if idx is not None:
+                if not idx._dirty:
+                    return None
+            elif self._dlo >= self._dhi:
+                return None
+            elif not self._po and len(self._front) == len(back):
+                return self._compose_range()
+        front = self._front
+        if idx is not None:
+            tables = self._palette_tables
+            po = idx._po
+            bufops.map_palette(front, idx.buf, tables, 0, po, idx.n)
+            if po:
+                bufops.map_palette(front, idx.buf, tables, (idx.n - po) * self.bpp, 0, po)
+            sect = min(idx.n * self.bpp, len(front))
+            idx._dirty = False
+        else:
+            if len(front) != len(back):
+                front = self._front = bytearray(len(back))
+            # the section rotates in place of a normalize, the back buffer keeps its scroll offset
+            sect = min((self.repeat_n or self.n) * self.bpp, len(back))
+            if self._po:
+                bufops.rotate_into(front, back, self._po * self.bpp, sect)
             else:
-                d = -1
+                front[0:sect] = memoryview(back)[0:sect]
+        mode = self.repeat_mode
+        if sect < len(front):
+            if mode == TrickLED.REPEAT_MODE_STRIPE:
+                self._repeat_stripe(None, front)
+            elif mode == TrickLED.REPEAT_MODE_MIRROR:
+                self._repeat_mirror(None, front)
+            elif idx is None:
+                front[sect:] = memoryview(back)[sect:]
+        if self._correction:
+            bufops.apply_tables(front, self._correction)
+        self._dirty = False
+        self._dlo = self._dhi = 0
+        self._wkey = wkey
+        self._wbuf = back
+        return front
+
+    def _compose_range(self):
+        """ Compose only the changed range into the front buffer, the rest of it is still current. Return
+            None if the range is covered by the repeated copies of the section. """
+        bpp = self.bpp
+        front = self._front
+        rn = self.repeat_n or self.n
+        mode = self.repeat_mode
+        repeat = rn < self.n and (mode == TrickLED.REPEAT_MODE_STRIPE or mode == TrickLED.REPEAT_MODE_MIRROR)
+        lo = self._dlo * bpp
+        hi = min(self._dhi, rn if repeat else self.n) * bpp
+        self._dlo = self._dhi = 0
+        if lo >= hi:
+            return None
+        front[lo:hi] = memoryview(self.buf)[lo:hi]
+        if self._correction:
+            bufops.apply_tables(front, self._correction, hi, lo)
+        # the copies of the section are made from the corrected front buffer
+        if repeat:
+            if mode == TrickLED.REPEAT_MODE_STRIPE:
+                self._repeat_stripe(None, front)
+            else:
+                self._repeat_mirror(None, front)
+        return front
 
-    def write(self):
-        if self.repeat_n:
-            if self.repeat_mode == TrickLED.REPEAT_MODE_STRIPE:
-                self._repeat_stripe()
-            elif self.repeat_mode == TrickLED.REPEAT_MODE_MIRROR:
-                self._repeat_mirror()
-        super().write()
+    def _send(self, front):
+        """ Send the composed frame to the strip """
+        back = self.buf
+        # NeoPixel.write() sends self.buf, point it at the front buffer while sending
+        self.buf = front
+        try:
+            super().write()
+        finally:
+            self.buf = back
 
 
-class TrickMatrix(NeoPixel):
+class TrickSegment(TrickLED):
+    """
+    A run of pixels of a parent TrickLED that an animation can draw into as if it was a strip of its own.
+    write() composes the segment into its own front buffer instead of sending it. merge() then combines
+    it into the parent's buffer with its blend mode and opacity, so segments can also be stacked as
+    layers. animations.Compositor merges all segments and sends the parent once per tick. The parent
+    should not be scrolled.
+    """
+    def __init__(self, parent, start, n, repeat_n=None, repeat_mode=None, blend_mode=BLEND_COPY, opacity=255):
+        """
+        :param parent: TrickLED the segment belongs to
+        :param start: Position of the first pixel of the segment on the parent
+        :param n: Number of pixels
+        :param repeat_n: If set, the first n pixels will be repeated across the rest of the segment
+        :param repeat_mode: Controls if section is repeated or mirrored
+        :param blend_mode: How the segment is merged over what is below it, BLEND_COPY, BLEND_ADD,
+                           BLEND_SCREEN, BLEND_MAX or BLEND_ALPHA. Blending happens before the parent
+                           applies its correction, on gamma encoded bytes
+        :param opacity: 0-255, strength of the segment when merged
+        """
+        if start < 0 or start + n > parent.n:
+            raise ValueError('Segment {}-{} does not fit a strip of {} pixels'.format(start, start + n - 1, parent.n))
+        # the parent applies the correction when it writes the merged frame
+        super().__init__(parent.pin, n, repeat_n, repeat_mode, brightness=255, bpp=parent.bpp,
+                         timing=parent.timing)
+        self.parent = parent
+        self.start = start
+        self.ORDER = parent.ORDER
+        self.blend_mode = blend_mode
+        self.opacity = opacity
+        # set when a new frame was composed and not merged yet
+        self.changed = False
+
+    def _send(self, front):
+        self.changed = True
+
+    def merge(self):
+        """ Combine the last composed frame into the parent's buffer """
+        self.parent._rgb()
+        bufops.blend_into(self.parent.buf, self._front, self.start * self.bpp, self.blend_mode, self.opacity)
+        self.changed = False
+
+
+class TrickMatrix(TrickLED):
+    """ TrickLED arranged as a panel of rows. Everything TrickLED does works on the panel in strip order, so
+        strip animations run along the rows (and back along the next on a snake layout). The drawing and
+        scrolling methods work in x, y coordinates.
+
+        With repeat_n set to a multiple of width only the first repeat_n // width rows are calculated and
+        scrolled, write() repeats them over the rest of the panel. On a snake layout use a multiple of
+        2 * width for the repeated rows to run the same direction.
+    """
     # All rows run in the same direction
     LAYOUT_STRAIGHT = const(1)
     # Direction of rows alternate from right to left
     LAYOUT_SNAKE = const(2)
     
-    def __init__(self, pin, width, height, shape=None, **kwargs):
+    def __init__(self, pin, width, height, shape=None, repeat_n=None, repeat_mode=None, **kwargs):
         if shape is None:
             self.shape = self.LAYOUT_SNAKE
         else:
             self.shape = shape
         self.width = width
         self.height = height
-        super().__init__(pin, width * height, **kwargs)    
-    
-    def _idx(self, x, y):
-        """ Return the index of the x, y coordinate """
-        if x >= self.width or y >= self.height:
-            raise IndexError('Out of bounds error. Dimensions are %d x %d' % (self.width, self.height))
+        super().__init__(pin, width * height, repeat_n, repeat_mode, **kwargs)
+        # strip index of every x, y coordinate, row by row, so a lookup is a single array index
+        self._index = array('H', [self._calc_idx(x, y) for y in range(height) for x in range(width)])
+        # one row of pixels and a copy of the panel for scrolling
+        self._row = bytearray(width * self.bpp)
+        self._vbuf = None
+
+    @property
+    def rows(self):
+        """ Number of rows that are calculated, the rest are repeated by write() """
+        return (self.repeat_n or self.n) // self.width
+
+    def _calc_idx(self, x, y):
         if y % 2 == 0 or self.shape == self.LAYOUT_STRAIGHT:
             return self.width * y + x
         else:
-            return self.width * (y + 1) - x - 1          
-        
+            return self.width * (y + 1) - x - 1
+
+    def _idx(self, x, y):
+        """ Return the index of the x, y coordinate """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError('Out of bounds error. Dimensions are %d x %d' % (self.width, self.height))
+        return self._index[self.width * y + x]
+
+    def _reversed_row(self, y):
+        """ True if x runs right to left on row y """
+        return self.shape == self.LAYOUT_SNAKE and y & 1
+
     def pixel(self, x, y, color=None):
         """
         Get or set the color of pixel at x,y coordinate
@@ -628,27 +1141,157 @@ class TrickMatrix(NeoPixel):
         if color is None:
             return self[idx]
         else:
-            if isinstance(color, int):
-                color = color.to_bytes(self.bpp, 'big')
             self[idx] = color
-            
+
+    def _plane(self):
+        """ Return the buffer holding the calculated rows in strip order, its bytes per pixel and row count """
+        if self.index is not None:
+            # indexed color mode, the rows are palette indexes
+            self.index._normalize()
+            return self.index.buf, 1, self.index.n // self.width
+        self._normalize()
+        return self.buf, self.bpp, self.rows
+
+    def _plane_pixel(self, color):
+        """ Return the bytes of one pixel of the plane, color is a palette index in indexed color mode """
+        if self.index is not None:
+            return bytes((uint8(color),))
+        return self._pixel_bytes(color)
+
+    def _fill_row(self, buf, bpp, x, y, width, px):
+        # x to x + width - 1 is one run of the strip on either layout, in reverse order on snake rows
+        if self._reversed_row(y):
+            start = self._index[self.width * y + x + width - 1]
+        else:
+            start = self._index[self.width * y + x]
+        bufops.fill_pattern(buf, px, start * bpp, (start + width) * bpp)
+
     def hline(self, x, y, width, color):
-        for ix in range(x, x + width):
-            self.pixel(ix, y, color)
+        """
+        Draw width pixels to the right of x, y. In indexed color mode color is a palette index. Like blit(),
+        only the calculated rows are drawn, a line on a row write() repeats over is skipped.
+        """
+        if width <= 0:
+            return
+        self._idx(x, y)
+        self._idx(x + width - 1, y)
+        buf, bpp, rows = self._plane()
+        if y >= rows:
+            return
+        self._fill_row(buf, bpp, x, y, width, self._plane_pixel(color))
+        self._dirty = True
     
     def vline(self, x, y, height, color):
-        for iy in range(y, y + height):
-            self.pixel(x, iy, color)
+        """ Draw height pixels down from x, y, clipped to the calculated rows like hline() """
+        if height <= 0:
+            return
+        self._idx(x, y)
+        self._idx(x, y + height - 1)
+        buf, bpp, rows = self._plane()
+        height = min(height, rows - y)
+        if height <= 0:
+            return
+        px = self._plane_pixel(color)
+        index = self._index
+        for i in range(self.width * y + x, self.width * (y + height), self.width):
+            j = index[i] * bpp
+            buf[j:j + bpp] = px
+        self._dirty = True
     
     def fill_rect(self, x, y, width, height, color):
+        """ Fill width x height pixels from x, y, clipped to the calculated rows like hline() """
+        if width <= 0 or height <= 0:
+            return
+        self._idx(x, y)
+        self._idx(x + width - 1, y + height - 1)
+        buf, bpp, rows = self._plane()
+        height = min(height, rows - y)
+        if height <= 0:
+            return
+        px = self._plane_pixel(color)
         for iy in range(y, y + height):
-            for ix in range(x, x + width):
-                self.pixel(ix, iy, color)
-    
+            self._fill_row(buf, bpp, x, iy, width, px)
+        self._dirty = True
+
+    def blit(self, src, y=0):
+        """
+        Copy whole rows to the panel starting at row y. src holds the rows one after another, each in x order
+        and strip byte order, the rows of a snake layout are reversed on the way. In indexed color mode the
+        rows are palette indexes, one byte per pixel. Only the calculated rows are written, rows write()
+        repeats over the rest of the panel are skipped.
+
+        :param src: Buffer of rows, width * bpp bytes each
+        :param y: First row to copy to
+        """
+        buf, bpp, h = self._plane()
+        rb = self.width * bpp
+        rows = min(len(src) // rb, h - y)
+        if rows <= 0:
+            return
+        mv = memoryview(buf)
+        smv = memoryview(src)
+        if self.shape == self.LAYOUT_STRAIGHT:
+            buf[y * rb:(y + rows) * rb] = smv[0:rows * rb]
+        else:
+            for r in range(rows):
+                dst = (y + r) * rb
+                if self._reversed_row(y + r):
+                    bufops.reverse_into(mv[dst:dst + rb], smv[r * rb:(r + 1) * rb], rb, bpp)
+                else:
+                    buf[dst:dst + rb] = smv[r * rb:(r + 1) * rb]
+        self._dirty = True
+
     def hscroll(self, step):
-        """ TODO: implement matrix scrolling """
-        pass
+        """
+        Scroll every row step pixels to the right, negative to the left. Pixels wrap around to the other side.
+        """
+        w = self.width
+        s = step % w
+        if not s:
+            return
+        buf, bpp, rows = self._plane()
+        rb = w * bpp
+        row = self._row
+        rmv = memoryview(row)
+        mv = memoryview(buf)
+        for y in range(rows):
+            start = y * rb
+            row[0:rb] = mv[start:start + rb]
+            # x moves right, which is toward the start of the strip on a reversed row
+            shift = s * bpp if self._reversed_row(y) else (w - s) * bpp
+            k = rb - shift
+            buf[start:start + k] = rmv[shift:rb]
+            buf[start + k:start + rb] = rmv[0:shift]
+        self._dirty = True
 
     def vscroll(self, step):
-        """ TODO: implement matrix scrolling """
-        pass
+        """
+        Scroll every column step pixels down, negative up. Rows wrap around to the other side.
+        """
+        buf, bpp, h = self._plane()
+        if not h:
+            return
+        s = step % h
+        if not s:
+            return
+        rb = self.width * bpp
+        end = h * rb
+        if self._vbuf is None or len(self._vbuf) < end:
+            self._vbuf = bytearray(end)
+        dst = self._vbuf
+        if self.shape == self.LAYOUT_STRAIGHT:
+            # the rows are contiguous, so moving them is one rotation
+            bufops.rotate_into(dst, buf, (h - s) * rb, end)
+        else:
+            mv = memoryview(buf)
+            row = memoryview(self._row)[0:rb]
+            for y in range(h):
+                sy = (y - s) % h
+                src = mv[sy * rb:(sy + 1) * rb]
+                if (y - sy) & 1:
+                    # the row moves to a row running the other way
+                    bufops.reverse_into(row, src, rb, bpp)
+                    src = row
+                dst[y * rb:(y + 1) * rb] = src
+        buf[0:end] = memoryview(dst)[0:end]
+        self._dirty = True
@@ -25,7 +25,7 @@ def get_colors_from_file():
             return get_default_colors()
 
 def get_default_colors():
-    return {"rgb":0, "effect":"ani_solid_color", "generator":None}
+    return {"rgb":0, "effect":"ani_solid_color", "generator":None, "palette":None}
 
 
 ## MAIN SCRIPT
@@ -75,7 +75,7 @@ def index(req, resp):
         sys.print_exception(e)
         colors = get_colors_from_file()
         set_task(asyncio.create_task(effects.get_effect(leds, colors).play()))
-    for i in range(0, 8):
+    for i in range(0, 11):
         yield from resp.awrite(web_page(colors, i))
 
 ROUTES = [
@@ -0,0 +1,72 @@
+"""
+Run the trickLED library and effects on a desktop CPython. Importing this package makes the MicroPython
+modules the code depends on importable:
+
+- neopixel, machine and micropython come from sim/modules
+- time gets ticks_ms, ticks_us, ticks_diff, ticks_add, sleep_ms and sleep_us
+- uasyncio is asyncio with sleep_ms added
+- lib/ is put first on sys.path so the trickLED library is imported from lib/ like on the board
+
+    import sim
+    from trickLED import trickLED
+"""
+import asyncio
+import os
+import sys
+import time
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+LIB = os.path.join(os.path.dirname(_HERE), 'lib')
+MODULES = os.path.join(_HERE, 'modules')
+
+# MicroPython ticks wrap around, the host counters are plain ints that do not
+TICKS_PERIOD = 1 << 30
+
+
+def _ticks_ms():
+    return (time.perf_counter_ns() // 1000000) % TICKS_PERIOD
+
+
+def _ticks_us():
+    return (time.perf_counter_ns() // 1000) % TICKS_PERIOD
+
+
+def _ticks_diff(end, start):
+    return ((end - start + TICKS_PERIOD // 2) % TICKS_PERIOD) - TICKS_PERIOD // 2
+
+
+def _ticks_add(ticks, delta):
+    return (ticks + delta) % TICKS_PERIOD
+
+
+async def _sleep_ms(ms):
+    await asyncio.sleep(ms / 1000)
+
+
+def install(lib=None):
+    """
+    Patch the host so the MicroPython code can be imported. Safe to call more than once.
+
+    :param lib: Directory with the trickLED library to use instead of lib/, see sim.at
+    """
+    global LIB
+    if lib is not None:
+        LIB = lib
+    for path in (MODULES, LIB):
+        if path in sys.path:
+            sys.path.remove(path)
+        sys.path.insert(0, path)
+    if not hasattr(time, 'ticks_ms'):
+        time.ticks_ms = _ticks_ms
+        time.ticks_us = _ticks_us
+        time.ticks_diff = _ticks_diff
+        time.ticks_add = _ticks_add
+        time.sleep_ms = lambda ms: time.sleep(ms / 1000)
+        time.sleep_us = lambda us: time.sleep(us / 1000000)
+    if not hasattr(asyncio, 'sleep_ms'):
+        asyncio.sleep_ms = _sleep_ms
+    # lib/uasyncio is the MicroPython implementation, use the host asyncio instead
+    sys.modules['uasyncio'] = asyncio
+
+
+install()
@@ -0,0 +1,53 @@
+"""
+Run a benchmark or script against the tree of an earlier commit, using the host shims of the current sim
+package. The benchmarks in bench/ are older than sim/, so the commits that added them can only be measured
+this way.
+
+    python -m sim.at f7e4e71 bench.colortable
+    python -m sim.at HEAD~3 sim.run -n 300 ani_fire
+
+The commit is extracted with git archive into a temporary directory that is put first on sys.path, with its
+lib/ in front of it, so the module and the trickLED library both come from that commit.
+"""
+import io
+import os
+import runpy
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+from . import install
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def extract(rev, dest):
+    """ Extract the tree of rev into dest """
+    data = subprocess.run(['git', 'archive', '--format=tar', rev], cwd=ROOT, check=True,
+                          stdout=subprocess.PIPE).stdout
+    with tarfile.open(fileobj=io.BytesIO(data)) as tar:
+        tar.extractall(dest)
+
+
+def main():
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(2)
+    rev, module = sys.argv[1:3]
+    with tempfile.TemporaryDirectory() as tmp:
+        extract(rev, tmp)
+        for path in (ROOT, ''):
+            while path in sys.path:
+                sys.path.remove(path)
+        sys.path.insert(0, tmp)
+        install(os.path.join(tmp, 'lib'))
+        if os.path.isdir(os.path.join(tmp, 'sim')):
+            # sim is already imported from the current tree, run the sim modules of rev
+            sys.modules[__package__].__path__ = [os.path.join(tmp, 'sim')]
+        sys.argv = [module] + sys.argv[3:]
+        runpy.run_module(module, run_name='__main__', alter_sys=True)
+
+
+if __name__ == '__main__':
+    main()
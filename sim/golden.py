@@ -0,0 +1,109 @@
+"""
+Golden frame check: runs every ani_* effect from a fixed seed and compares a hash of the frames it sends
+with the hashes stored in sim/golden.txt. An engine change that keeps the output the same passes, one that
+changes a single byte of any frame fails and names the effect, size and generator.
+
+    python -m sim.golden              # check
+    python -m sim.golden --update     # store the current output as the new golden hashes
+
+Each line of golden.txt is: effect n generator frames_sent sha1_prefix
+"""
+import argparse
+import hashlib
+import os
+import sys
+
+from . import LIB  # noqa: F401 - importing sim sets up the host
+
+import effects
+from .run import make_effect
+
+GOLDEN = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden.txt')
+SIZES = (10, 57, 300)
+FRAMES = 120
+GENERATORS = ('gen_stepped_color_wheel', 'gen_random_vivid', 'gen_random_pastel')
+SEED = 1
+
+
+def frame_hash(name, n, generator, frames=FRAMES, seed=SEED):
+    """ Return (frames sent, hash) of frames 1..frames of the effect. """
+    ani = make_effect(name, n, generator, seed=seed)
+    leds = ani.leds
+    leds.frames = []
+    h = hashlib.sha1()
+    sent = 0
+    for f in range(1, frames + 1):
+        ani.frame += 1
+        ani.calc_frame()
+        leds.write()
+        if leds.frames:
+            # the frame number is hashed too, so sending on different frames is a change
+            h.update(f.to_bytes(4, 'little'))
+            h.update(leds.frames[-1])
+            leds.frames.clear()
+            sent += 1
+    return sent, h.hexdigest()[:16]
+
+
+def collect(names=None, sizes=SIZES, generators=GENERATORS, frames=FRAMES):
+    """ Return {(effect, n, generator): (frames sent, hash)} """
+    names = names or effects.get_effect_names()
+    return {(name, n, gen): frame_hash(name, n, gen, frames)
+            for name in names for n in sizes for gen in generators}
+
+
+def load(path=GOLDEN):
+    golden = {}
+    with open(path) as f:
+        for line in f:
+            if line.strip() and not line.startswith('#'):
+                name, n, gen, sent, digest = line.split()
+                golden[(name, int(n), gen)] = (int(sent), digest)
+    return golden
+
+
+def save(results, path=GOLDEN):
+    with open(path, 'w') as f:
+        f.write('# effect n generator frames_sent sha1, seed {} frames 1..{}, see sim/golden.py\n'.format(
+            SEED, FRAMES))
+        for key in sorted(results):
+            f.write('{} {} {} {} {}\n'.format(*key, *results[key]))
+
+
+def check(names=None, sizes=SIZES):
+    """ Compare with golden.txt, print the differences and return the number of failures """
+    golden = load()
+    keys = [k for k in sorted(golden) if (not names or k[0] in names) and k[1] in sizes]
+    missing = [name for name in (names or effects.get_effect_names()) if not any(k[0] == name for k in golden)]
+    failed = 0
+    for key in keys:
+        got = frame_hash(*key)
+        if got != golden[key]:
+            failed += 1
+            print('FAIL {} n={} {}: sent {} {}, golden {} {}'.format(*key, *got, *golden[key]))
+    for name in missing:
+        failed += 1
+        print('FAIL {}: no golden frames, run with --update'.format(name))
+    print('{} of {} golden runs match'.format(len(keys) - failed + len(missing), len(keys)))
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('effects', nargs='*', help='ani_* names, all effects by default')
+    parser.add_argument('-n', '--sizes', default=','.join(str(n) for n in SIZES),
+                        help='comma separated strip lengths')
+    parser.add_argument('--update', action='store_true', help='store the current output as golden')
+    args = parser.parse_args()
+    sizes = tuple(int(n) for n in args.sizes.split(','))
+    if args.update:
+        results = load() if os.path.exists(GOLDEN) else {}
+        results.update(collect(args.effects, sizes))
+        save(results)
+        print('stored {} golden runs in {}'.format(len(results), GOLDEN))
+        return
+    sys.exit(1 if check(args.effects, sizes) else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+""" Host version of the parts of the machine module used by PanelLight """
+
+
+class Pin:
+    IN = 0
+    OUT = 1
+    PULL_UP = 1
+    PULL_DOWN = 2
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        self.id = id
+        self.mode = mode
+        self._val = value or 0
+
+    def value(self, val=None):
+        if val is None:
+            return self._val
+        self._val = 1 if val else 0
+
+    def on(self):
+        self._val = 1
+
+    def off(self):
+        self._val = 0
+
+    def __repr__(self):
+        return 'Pin({})'.format(self.id)
+
+
+def freq(hz=None):
+    return 240000000
+
+
+def reset():
+    raise SystemExit('machine.reset()')
@@ -0,0 +1,57 @@
+"""
+Host version of the MicroPython neopixel module. Pixels live in a bytearray in GRB(W) order just like
+on the board. write() does not send anything, it counts the writes, times them and works out how long
+the strip would take to receive the frame.
+"""
+import time
+
+
+class NeoPixel:
+    ORDER = (1, 0, 2, 3)
+
+    def __init__(self, pin, n, bpp=3, timing=1):
+        self.pin = pin
+        self.n = n
+        self.bpp = bpp
+        self.buf = bytearray(n * bpp)
+        self.timing = timing
+        # write statistics
+        self.writes = 0
+        self.write_ns = 0
+        # set to a list to keep a copy of every frame written
+        self.frames = None
+
+    def __len__(self):
+        return self.n
+
+    def __setitem__(self, i, v):
+        offset = i * self.bpp
+        for i in range(self.bpp):
+            self.buf[offset + self.ORDER[i]] = v[i]
+
+    def __getitem__(self, i):
+        offset = i * self.bpp
+        return tuple(self.buf[offset + self.ORDER[i]] for i in range(self.bpp))
+
+    def fill(self, v):
+        b = self.buf
+        l = len(self.buf)
+        bpp = self.bpp
+        for i in range(bpp):
+            c = v[i]
+            j = self.ORDER[i]
+            while j < l:
+                b[j] = c
+                j += bpp
+
+    def write(self):
+        st = time.perf_counter_ns()
+        if self.frames is not None:
+            self.frames.append(bytes(self.buf))
+        self.writes += 1
+        self.write_ns += time.perf_counter_ns() - st
+
+    def wire_us(self):
+        """ Microseconds the strip needs to receive one frame, 1.25 us per bit at 800kHz plus the latch """
+        bit_us = 1.25 if self.timing == 1 else 2.5
+        return len(self.buf) * 8 * bit_us + 50
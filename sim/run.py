@@ -0,0 +1,112 @@
+"""
+Play every ani_* effect from effects.Effects on the simulated strip and report the frame rate, the
+cost per pixel and the memory allocated per frame. This is the baseline for performance work.
+
+    python -m sim.run
+    python -m sim.run -n 58,300 -f 100 ani_fire ani_jitter
+    python -m sim.run -w 16 -n 256,1024     # on 16 pixel wide snake layout panels
+
+Frames are rendered back to back with the same steps as AnimationBase.play() minus the sleep. The
+timed pass measures calc_frame() plus write() and counts the share of frames actually sent to the
+strip (write() skips unchanged frames). A second pass runs under tracemalloc and reports the
+bytes allocated by a frame above what was live before it (the tracemalloc peak), averaged over frames.
+"""
+import argparse
+import contextlib
+import io
+import random
+import time
+import tracemalloc
+
+from . import LIB  # noqa: F401 - importing sim sets up the host
+
+import machine
+import effects
+from trickLED import prng, trickLED
+
+SIZES = (58, 300, 1000)
+FRAMES = 200
+GENERATOR = 'gen_stepped_color_wheel'
+
+
+def make_effect(name, n, generator=GENERATOR, rgb=0x828282, seed=1, palette=None, width=None):
+    """ Create the effect on a fresh strip the way main.py does, or on a TrickMatrix width pixels wide """
+    random.seed(seed)
+    prng.seed(seed)
+    pin = machine.Pin(12, machine.Pin.OUT)
+    if width:
+        leds = trickLED.TrickMatrix(pin, width, n // width, timing=1)
+    else:
+        leds = trickLED.TrickLED(pin, n, timing=1)
+    colors = {'rgb': rgb, 'effect': name, 'generator': generator, 'palette': palette}
+    # the effects print their settings, keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        ani = effects.get_effect(leds, colors)
+        ani.leds.fill((0, 0, 0))
+        ani.setup()
+    return ani
+
+
+def time_frames(ani, frames):
+    """ Return the average nanoseconds per frame of calc_frame() and write(), and the share of frames sent """
+    leds = ani.leds
+    w0 = leds.writes
+    st = time.perf_counter_ns()
+    for _ in range(frames):
+        ani.frame += 1
+        ani.calc_frame()
+        leds.write()
+    return (time.perf_counter_ns() - st) / frames, (leds.writes - w0) / frames
+
+
+def alloc_frames(ani, frames):
+    """ Return the average bytes allocated per frame above the memory in use before the frame """
+    leds = ani.leds
+    total = 0
+    tracemalloc.start()
+    try:
+        for _ in range(frames):
+            cur = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            ani.frame += 1
+            ani.calc_frame()
+            leds.write()
+            total += tracemalloc.get_traced_memory()[1] - cur
+    finally:
+        tracemalloc.stop()
+    return total / frames
+
+
+def run(names=None, sizes=SIZES, frames=FRAMES, generator=GENERATOR, palette=None, width=None):
+    names = names or effects.get_effect_names()
+    print('{:<20} {:>6} {:>9} {:>11} {:>9} {:>11} {:>9} {:>7}'.format(
+        'effect', 'n', 'fps', 'us/frame', 'us/px', 'alloc B/f', 'wire us', 'sent %'))
+    for name in names:
+        for n in sizes:
+            ani = make_effect(name, n, generator, palette=palette, width=width)
+            ns, sent = time_frames(ani, frames)
+            alloc = alloc_frames(make_effect(name, n, generator, palette=palette, width=width),
+                                 max(frames // 4, 1))
+            n = ani.leds.n
+            us = ns / 1000
+            print('{:<20} {:>6d} {:>9.1f} {:>11.1f} {:>9.3f} {:>11.0f} {:>9.0f} {:>7.0f}'.format(
+                name, n, 1000000 / us if us else 0, us, us / n, alloc, ani.leds.wire_us(), sent * 100))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('effects', nargs='*', help='ani_* names, all effects by default')
+    parser.add_argument('-n', '--sizes', default=','.join(str(n) for n in SIZES),
+                        help='comma separated strip lengths')
+    parser.add_argument('-f', '--frames', type=int, default=FRAMES, help='frames per effect and size')
+    parser.add_argument('-g', '--generator', default=GENERATOR, help='gen_* name passed to the effects')
+    parser.add_argument('-p', '--palette', help='palette name passed to the effects, see effects.get_palette_names()')
+    parser.add_argument('-w', '--width', type=int,
+                        help='run on a TrickMatrix this many pixels wide, the sizes are rounded down to whole rows')
+    args = parser.parse_args()
+    run(args.effects, [int(n) for n in args.sizes.split(',')], args.frames, args.generator, args.palette,
+        args.width)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,14 @@
+"""
+The tests run on the host through the sim package, which provides the MicroPython modules and puts the
+trickLED library from lib/ first on sys.path.
+
+    python -m pytest -q
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import sim  # noqa: E402,F401
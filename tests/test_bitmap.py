@@ -0,0 +1,87 @@
+"""
+The word level BitMap operations must give the same bits as going through the map one bit at a time.
+"""
+import pytest
+
+from trickLED import prng, trickLED
+
+SIZES = (1, 7, 8, 31, 32, 33, 58, 100)
+
+
+def bits(bm):
+    return [bm[i] for i in range(bm.n)]
+
+
+def random_map(n, seed, pct=40):
+    bm = trickLED.BitMap(n)
+    bm.randomize(pct, rng=prng.Xorshift(seed))
+    return bm
+
+
+@pytest.mark.parametrize('n', SIZES)
+def test_count_and_iter_bits(n):
+    for scroll in (0, 1, 5, n + 3):
+        bm = random_map(n, n)
+        bm.scroll(scroll)
+        ref = bits(bm)
+        assert bm.count() == sum(ref)
+        assert list(bm.iter_bits()) == [i for i, b in enumerate(ref) if b]
+        assert list(bm.iter_bits(0)) == [i for i, b in enumerate(ref) if not b]
+        stop = n // 2
+        assert list(bm.iter_bits(1, stop)) == [i for i, b in enumerate(ref[:stop]) if b]
+
+
+@pytest.mark.parametrize('n', SIZES)
+def test_runs(n):
+    bm = random_map(n, n + 1, 60)
+    bm.scroll(2)
+    ref = bits(bm)
+    expanded = [0] * n
+    for start, end in bm.runs():
+        assert end > start
+        for i in range(start, end):
+            expanded[i] = 1
+    assert expanded == ref
+
+
+@pytest.mark.parametrize('n', SIZES)
+def test_scroll_normalize(n):
+    bm = random_map(n, 2 * n)
+    ref = bits(bm)
+    for step in (1, -3, n + 2):
+        bm.scroll(step)
+        ref = [ref[(i - step) % n] for i in range(n)]
+        assert bits(bm) == ref
+    bm._normalize()
+    assert bits(bm) == ref
+
+
+@pytest.mark.parametrize('n', SIZES)
+def test_masks(n):
+    a = random_map(n, 5)
+    b = random_map(n, 6)
+    a.scroll(3)
+    ra = bits(a)
+    rb = bits(b)
+    c = random_map(n, 5)
+    c.scroll(3)
+    c.bit_and(b)
+    assert bits(c) == [x & y for x, y in zip(ra, rb)]
+    c = random_map(n, 5)
+    c.scroll(3)
+    c.bit_or(b)
+    assert bits(c) == [x | y for x, y in zip(ra, rb)]
+    c = random_map(n, 5)
+    c.scroll(3)
+    c.bit_xor(b)
+    assert bits(c) == [x ^ y for x, y in zip(ra, rb)]
+    c.invert()
+    assert bits(c) == [1 - (x ^ y) for x, y in zip(ra, rb)]
+    with pytest.raises(ValueError):
+        a.bit_and(trickLED.BitMap(n + 1))
+
+
+def test_repeat():
+    bm = trickLED.BitMap(40)
+    bm.repeat(0b1001)
+    assert bits(bm)[:16] == [1, 0, 0, 1, 0, 0, 0, 0] * 2
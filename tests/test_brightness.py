@@ -0,0 +1,62 @@
+"""
+Default output level. The baseline generators drew the color wheel at global_setings['brightness'], now
+they draw at full brightness and write() applies the same level to the whole frame.
+"""
+import pytest
+
+from trickLED import generators, trickLED
+import effects
+from sim.run import make_effect
+
+# peak byte sent over 120 frames of 57 pixels with gen_stepped_color_wheel, measured on the baseline
+# commit a93b512 with sim.at
+BASELINE = {
+    'ani_divergent': 87,
+    'ani_jitter': 100,
+    'ani_next_gen': 100,
+    'ani_side_swipe': 99,
+}
+
+
+def peak(name, generator='gen_stepped_color_wheel', n=57, frames=120):
+    ani = make_effect(name, n, generator)
+    leds = ani.leds
+    leds.frames = []
+    for _ in range(frames):
+        ani.frame += 1
+        ani.calc_frame()
+        leds.write()
+    return max((max(f) for f in leds.frames), default=0)
+
+
+def test_default_brightness():
+    leds = trickLED.TrickLED(None, 4)
+    assert leds.brightness == trickLED.global_setings['brightness']
+    assert trickLED.TrickSegment(leds, 0, 2).brightness == 255
+    leds.fill((255, 255, 255))
+    leds.frames = []
+    leds.write()
+    assert max(leds.frames[0]) == trickLED.global_setings['brightness']
+
+
+def test_color_wheel_matches_baseline():
+    level = trickLED.global_setings['brightness']
+    leds = trickLED.TrickLED(None, 255)
+    leds.frames = []
+    leds.fill_gen(generators.stepped_color_wheel(1, 1))
+    leds.write()
+    frame = leds.frames[0]
+    for h in range(255):
+        want = trickLED.color_wheel(h, level)
+        got = [frame[h * 3 + leds.ORDER[c]] for c in range(3)]
+        assert all(abs(a - b) <= 1 for a, b in zip(got, want)), h
+
+
+@pytest.mark.parametrize('name', sorted(BASELINE))
+def test_effect_level_matches_baseline(name):
+    assert peak(name) == BASELINE[name]
+
+
+@pytest.mark.parametrize('name', effects.get_effect_names())
+def test_no_effect_brighter_than_default(name):
+    assert peak(name) <= trickLED.global_setings['brightness']
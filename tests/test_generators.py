@@ -0,0 +1,93 @@
+"""
+The block protocol of the color generators: fill_into() must write the same colors as next(), on 1 byte
+ByteMaps and on RGBW strips too.
+"""
+import pytest
+
+from trickLED import generators, prng, trickLED
+
+ORDER = (1, 0, 2, 3)
+
+
+def make(name):
+    if name == 'stepped':
+        return generators.stepped_color_wheel(10, 7)
+    if name == 'striped':
+        return generators.striped_color_wheel(7, 3)
+    if name == 'fading':
+        return generators.fading_color_wheel(10, 5)
+    if name == 'compliment':
+        return generators.color_compliment(10, 2)
+    if name == 'vivid':
+        return generators.random_vivid(rng=prng.Xorshift(3))
+    return generators.random_pastel(rng=prng.Xorshift(3))
+
+
+NAMES = ('stepped', 'striped', 'fading', 'compliment', 'vivid', 'pastel')
+# RandomPastel.fill_into draws its random bytes straight into the buffer, so the colors are not the ones
+# next() would have returned
+SAME = NAMES[:-1]
+
+
+class Levels(generators.ColorGenerator):
+    """ Only implements __next__, yields ints like a palette index or heat generator """
+    def __init__(self):
+        self.v = 0
+
+    def __next__(self):
+        self.v = (self.v + 37) & 255
+        return self.v
+
+
+class Block(generators.ColorGenerator):
+    """ Only implements fill_into """
+    def fill_into(self, buf, offset, count, order=generators.RGB_ORDER, bpp=3):
+        for j in range(offset, offset + count * bpp, bpp):
+            buf[j + order[0]] = 1
+            buf[j + order[1]] = 2
+            buf[j + order[2]] = 3
+
+
+@pytest.mark.parametrize('name', SAME)
+def test_fill_into_matches_next(name):
+    a = make(name)
+    b = make(name)
+    buf = bytearray(40 * 3)
+    b.fill_into(buf, 0, 40, ORDER, 3)
+    for i in range(40):
+        col = next(a)
+        assert (buf[i * 3 + 1], buf[i * 3], buf[i * 3 + 2]) == col, i
+
+
+@pytest.mark.parametrize('name', NAMES)
+def test_fill_into_clears_white(name):
+    leds = trickLED.TrickLED(None, 20, bpp=4)
+    leds.buf[:] = b'\xff' * len(leds.buf)
+    leds.fill_gen(make(name))
+    a = make(name)
+    for i in range(20):
+        assert leds.buf[i * 4 + 3] == 0, i
+        if name in SAME:
+            assert leds[i][:3] == next(a)[:3], i
+
+
+@pytest.mark.parametrize('name', NAMES)
+def test_byte_map_one_byte_items(name):
+    bm = trickLED.ByteMap(25, 1)
+    bm.fill_gen(make(name))
+    a = make(name)
+    assert len(bm.buf) == 25
+    if name in SAME:
+        assert [bm[i] for i in range(25)] == [next(a)[0] for _ in range(25)]
+
+
+def test_int_generator_on_byte_map():
+    bm = trickLED.ByteMap(10, 1)
+    bm.fill_gen(Levels())
+    assert list(bm.buf) == [(37 * (i + 1)) & 255 for i in range(10)]
+
+
+def test_default_next_uses_fill_into():
+    assert next(Block()) == (1, 2, 3)
+    with pytest.raises(TypeError):
+        next(generators.ColorGenerator())
@@ -0,0 +1,135 @@
+"""
+Indexed color mode: drawing colors must fail loudly instead of being lost, and index changes must show up
+in the frames that are sent.
+"""
+import pytest
+
+from trickLED import animations32, bufops, generators, prng, trickLED
+
+PALETTE = [(0, 0, 0), (255, 0, 0), (0, 255, 0), (0, 0, 255)]
+
+
+def indexed(n=8, **kwargs):
+    leds = trickLED.TrickLED(None, n, brightness=255, **kwargs)
+    leds.frames = []
+    leds.set_palette(PALETTE)
+    return leds
+
+
+def sent_colors(leds):
+    """ RGB colors of the last frame sent """
+    frame = leds.frames[-1]
+    return [tuple(frame[i * 3 + leds.ORDER[c]] for c in range(3)) for i in range(leds.n)]
+
+
+@pytest.mark.parametrize('draw', (
+    lambda leds: leds.__setitem__(0, (1, 2, 3)),
+    lambda leds: leds.fill(0x102030),
+    lambda leds: leds.fill_solid(0x102030, 1, 3),
+    lambda leds: leds.fill_gradient(0, 0xffffff),
+    lambda leds: leds.fill_gen(generators.striped_color_wheel()),
+    lambda leds: leds.blend_to_color(0xffffff, 50),
+    lambda leds: leds.add(10),
+))
+def test_drawing_colors_raises(draw):
+    leds = indexed()
+    with pytest.raises(ValueError):
+        draw(leds)
+
+
+def test_index_writes_are_sent():
+    leds = indexed()
+    assert leds.write()
+    assert sent_colors(leds) == [(0, 0, 0)] * 8
+    leds.index[2] = 1
+    leds.index.fill(3, 5, 6)
+    assert leds.write()
+    assert sent_colors(leds) == [(0, 0, 0)] * 2 + [(255, 0, 0)] + [(0, 0, 0)] * 2 + [(0, 0, 255)] * 2 + [(0, 0, 0)]
+    assert leds[2] == (255, 0, 0)
+
+
+def test_unchanged_index_is_not_sent():
+    leds = indexed()
+    leds.write()
+    writes = leds.writes
+    assert not leds.write()
+    assert leds.writes == writes
+    leds.index.buf[0] = 2
+    leds.index.mark_dirty()
+    assert leds.write()
+    assert sent_colors(leds)[0] == (0, 255, 0)
+    leds.index.scroll(1)
+    assert leds.write()
+    assert sent_colors(leds)[1] == (0, 255, 0)
+
+
+def test_palette_cycle_is_sent():
+    leds = indexed()
+    leds.index.fill(1)
+    leds.write()
+    leds.cycle_palette(1)
+    assert leds.write()
+    assert sent_colors(leds)[0] == leds[0] != (255, 0, 0)
+
+
+@pytest.mark.parametrize('step', (1, 3, -1))
+def test_palette_cycle_matches_scrolled_palette(step):
+    leds = indexed()
+    pal = trickLED.ByteMap(0, 3)
+    for col in PALETTE:
+        pal.extend(col)
+    for _ in range(3):
+        leds.cycle_palette(step)
+        pal.scroll(step)
+        pal._normalize()
+        assert leds._palette_tables == bufops.expand_palette(pal.buf, pal.n, 3, leds.ORDER)
+
+
+def test_palette_cycle_of_tables():
+    leds = trickLED.TrickLED(None, 8, brightness=255)
+    leds.frames = []
+    # strip byte order, the neopixel order is GRB
+    tables = [bytes(range(256)), bytes(256), bytes(255 - i for i in range(256))]
+    leds.set_palette(tables=tables)
+    leds.index.fill(10)
+    leds.write()
+    leds.cycle_palette(4)
+    assert leds.write()
+    assert sent_colors(leds)[0] == leds[0] == (0, 6, 249)
+    # the tables passed in are not changed, later cycles reuse the strip's own two sets
+    assert tables[0] == bytes(range(256))
+    first = leds._palette_tables
+    leds.cycle_palette(1)
+    second = leds._palette_tables
+    leds.cycle_palette(1)
+    assert leds._palette_tables is first and second is not first
+    assert leds[0] == (0, 4, 251)
+
+
+def test_repeat_and_leave_indexed_mode():
+    leds = indexed(10, repeat_n=4, repeat_mode=trickLED.TrickLED.REPEAT_MODE_MIRROR)
+    assert leds.index.n == 4
+    leds.index[0] = 2
+    leds.write()
+    assert sent_colors(leds)[7] == (0, 255, 0)
+    leds.set_palette()
+    leds[0] = (9, 9, 9)
+    leds.write()
+    assert sent_colors(leds)[0] == (9, 9, 9)
+
+
+def test_fire_on_indexed_strip_matches_rgb():
+    frames = []
+    for mode in (False, True):
+        leds = trickLED.TrickLED(None, 40)
+        leds.frames = []
+        if mode:
+            leds.set_palette([(0, 0, 0)])
+        ani = animations32.Fire(leds, rng=prng.Xorshift(7))
+        ani.leds.clear()
+        ani.setup()
+        for _ in range(30):
+            ani.calc_frame()
+            leds.write()
+        frames.append(leds.frames)
+    assert frames[0] == frames[1]
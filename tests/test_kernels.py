@@ -0,0 +1,69 @@
+"""
+The fixed point gradient and blend kernels must stay within +/-1 per channel of the float versions they
+replaced. The float versions are the originals kept in bench/kernels.py.
+"""
+import pytest
+
+from trickLED import bufops, trickLED
+from bench.kernels import blend_to_color_float, fill_gradient_float
+
+COLORS = [(0, 0, 0), (255, 255, 255), (255, 0, 0), (3, 200, 77), (128, 1, 254), (17, 17, 250)]
+PCTS = (0, 1, 10, 33, 50, 60, 99, 100)
+
+
+def max_diff(a, b):
+    return max(abs(a[i] - b[i]) for i in range(len(a)))
+
+
+@pytest.mark.parametrize('n', (2, 3, 10, 58, 255, 1000))
+def test_fill_gradient_matches_float(n):
+    a = trickLED.TrickLED(None, n)
+    b = trickLED.TrickLED(None, n)
+    for c1 in COLORS:
+        for c2 in COLORS:
+            fill_gradient_float(a, c1, c2)
+            b.fill_gradient(c1, c2)
+            assert max_diff(a.buf, b.buf) <= 1, (c1, c2)
+
+
+@pytest.mark.parametrize('n', (2, 58, 300))
+def test_blend_to_color_matches_float(n):
+    a = trickLED.TrickLED(None, n)
+    b = trickLED.TrickLED(None, n)
+    for c1 in COLORS:
+        for c2 in COLORS:
+            a.fill_gradient(c1, c2)
+            for pct in PCTS:
+                b.buf[:] = a.buf
+                fill = bytes(a.buf)
+                blend_to_color_float(a, c2, pct)
+                b.blend_to_color(c2, pct)
+                assert max_diff(a.buf, b.buf) <= 1, (c1, c2, pct)
+                a.buf[:] = fill
+
+
+def test_blend8_is_8_8_fixed_point():
+    assert bufops.pct_to_alpha(0) == 0
+    assert bufops.pct_to_alpha(50) == 128
+    assert bufops.pct_to_alpha(100) == 256
+    for target in (0, 77, 255):
+        assert bufops.blend8(target, 0) == bytes(range(256))
+        assert bufops.blend8(target, 256) == bytes([target]) * 256
+        tbl = bufops.blend8(target, 128)
+        for i in range(256):
+            assert tbl[i] == i + (((target - i) * 128) >> 8)
+
+
+def test_blend_range_keeps_other_bytes():
+    buf = bytearray(range(30))
+    bufops.blend_range(buf, b'\xff\x00\x00', 256, 6, 15)
+    assert buf[:6] == bytes(range(6))
+    assert buf[6:15] == b'\xff\x00\x00' * 3
+    assert buf[15:] == bytes(range(15, 30))
+
+
+def test_byte_map_gradient_ends():
+    for n in (2, 20, 256):
+        a = trickLED.ByteMap(n, 1)
+        a.fill_gradient(0, 255)
+        assert a[0] == 0 and a[n - 1] == 255
@@ -0,0 +1,86 @@
+"""
+TrickMatrix drawing in RGB and indexed color mode.
+"""
+import pytest
+
+from trickLED import trickLED
+
+PALETTE = [(0, 0, 0), (255, 0, 0), (0, 255, 0), (0, 0, 255)]
+SHAPES = (trickLED.TrickMatrix.LAYOUT_STRAIGHT, trickLED.TrickMatrix.LAYOUT_SNAKE)
+
+
+def matrix(shape, w=5, h=4, indexed=False, **kwargs):
+    m = trickLED.TrickMatrix(None, w, h, shape, brightness=255, **kwargs)
+    m.frames = []
+    if indexed:
+        m.set_palette(PALETTE)
+    return m
+
+
+def sent(m, x, y):
+    """ RGB color of x, y in the last frame sent """
+    j = m._index[m.width * y + x] * m.bpp
+    px = m.frames[-1][j:j + m.bpp]
+    return tuple(px[m.ORDER[c]] for c in range(3))
+
+
+def draw(m, red, green, blue):
+    m.hline(1, 0, 3, red)
+    m.vline(4, 1, 3, green)
+    m.fill_rect(0, 2, 2, 2, blue)
+
+
+@pytest.mark.parametrize('shape', SHAPES)
+def test_indexed_drawing_is_sent(shape):
+    rgb = matrix(shape)
+    draw(rgb, PALETTE[1], PALETTE[2], PALETTE[3])
+    rgb.write()
+    m = matrix(shape, indexed=True)
+    m.write()
+    draw(m, 1, 2, 3)
+    assert m.write()
+    assert m.frames[-1] == rgb.frames[-1]
+    assert sent(m, 2, 0) == PALETTE[1]
+    assert sent(m, 4, 3) == PALETTE[2]
+    assert sent(m, 1, 3) == PALETTE[3]
+
+
+@pytest.mark.parametrize('shape', SHAPES)
+def test_indexed_blit_is_sent(shape):
+    m = matrix(shape, indexed=True)
+    m.write()
+    m.blit(bytes((1, 2, 3, 0, 1)), 2)
+    assert m.write()
+    assert [sent(m, x, 2) for x in range(5)] == [PALETTE[i] for i in (1, 2, 3, 0, 1)]
+
+
+@pytest.mark.parametrize('shape', SHAPES)
+@pytest.mark.parametrize('indexed', (False, True))
+def test_blit_stops_at_calculated_rows(shape, indexed):
+    m = matrix(shape, h=6, indexed=indexed, repeat_n=10)
+    buf, bpp, rows = m._plane()
+    assert rows == 2
+    before = bytes(buf)
+    m.blit(b'\x01' * (6 * 5 * bpp))
+    assert buf[0:10 * bpp] == b'\x01' * (10 * bpp)
+    assert buf[10 * bpp:] == before[10 * bpp:]
+
+
+@pytest.mark.parametrize('shape', SHAPES)
+@pytest.mark.parametrize('indexed', (False, True))
+def test_drawing_stops_at_calculated_rows(shape, indexed):
+    # 4 x 4 panel, the first 2 rows are calculated and repeated over the other 2
+    m = matrix(shape, w=4, h=4, indexed=indexed, repeat_n=8)
+    buf, bpp, rows = m._plane()
+    size = len(buf)
+    m.hline(0, 3, 4, 1)
+    m.vline(1, 1, 3, 2)
+    m.fill_rect(2, 0, 2, 4, 3)
+    assert len(buf) == size
+    ref = matrix(shape, w=4, h=4, indexed=indexed, repeat_n=8)
+    ref.vline(1, 1, 1, 2)
+    ref.fill_rect(2, 0, 2, 2, 3)
+    assert buf == ref._plane()[0]
+    m.write()
+    ref.write()
+    assert m.frames[-1] == ref.frames[-1]
@@ -0,0 +1,26 @@
+"""
+Frame scheduling of AnimationBase.play(): frames start on their deadline, not before it.
+"""
+import asyncio
+import time
+
+import pytest
+
+from trickLED import animations, trickLED
+
+
+@pytest.mark.parametrize('ival_us', (1500, 2000, 3700))
+def test_frames_never_start_early(ival_us):
+    ani = animations.AnimationBase(trickLED.TrickLED(None, 10))
+    late = []
+
+    async def run():
+        deadline = time.ticks_us()
+        for i in range(40):
+            # a frame that takes part of the interval, so the sleep is not a whole number of ms
+            time.sleep_us(i * 37 % ival_us)
+            deadline = await ani._wait(deadline, ival_us)
+            late.append(ani.late_us)
+
+    asyncio.run(run())
+    assert min(late) >= 0
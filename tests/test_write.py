@@ -0,0 +1,68 @@
+"""
+write() composes only the changed range when it can. The front buffer must always end up the same as a
+full compose, and frames that did not change must not be sent.
+"""
+import pytest
+
+from trickLED import prng, trickLED
+
+MODES = (None, trickLED.TrickLED.REPEAT_MODE_STRIPE, trickLED.TrickLED.REPEAT_MODE_MIRROR)
+
+
+def full_front(leds):
+    leds.mark_dirty()
+    leds._compose()
+    return bytes(leds._front)
+
+
+@pytest.mark.parametrize('mode', MODES)
+@pytest.mark.parametrize('n, rn', ((30, None), (30, 7), (31, 10), (20, 20)))
+@pytest.mark.parametrize('correction', (False, True))
+def test_range_compose_matches_full(mode, n, rn, correction):
+    rng = prng.Xorshift(n)
+    leds = trickLED.TrickLED(None, n, repeat_n=rn, repeat_mode=mode, brightness=255)
+    if correction:
+        leds.set_correction(brightness=150, gamma=2.2)
+    leds.fill_gradient((255, 0, 0), (0, 0, 255))
+    leds.write()
+    for frame in range(40):
+        op = rng.below(4)
+        i = rng.below(n)
+        if op == 0:
+            leds[i] = (rng.below(256), rng.below(256), rng.below(256))
+        elif op == 1:
+            leds.fill_solid(0x203040, i, min(i + 3, n - 1))
+        elif op == 2:
+            leds.blend_to_color(0, 30, 0, i)
+        else:
+            leds[i] = leds[i]
+        leds.write()
+        sent = bytes(leds._front)
+        assert sent == full_front(leds), frame
+
+
+def test_hidden_pixels_are_not_sent():
+    leds = trickLED.TrickLED(None, 20, repeat_n=5, repeat_mode=trickLED.TrickLED.REPEAT_MODE_MIRROR)
+    leds.write()
+    writes = leds.writes
+    # pixels past repeat_n are replaced by the repeated section, the frame does not change
+    leds[12] = 0xffffff
+    assert not leds.write()
+    assert leds.writes == writes and leds.skipped_writes == 1
+    leds[2] = 0xffffff
+    assert leds.write()
+    assert leds.writes == writes + 1
+
+
+def test_mark_dirty_range():
+    leds = trickLED.TrickLED(None, 10, brightness=255)
+    leds.write()
+    leds.buf[9:12] = b'\x01\x02\x03'
+    leds.mark_dirty(3)
+    assert leds.write()
+    # the changed pixel is composed without marking the whole frame
+    assert leds._front[9:12] == b'\x01\x02\x03'
+    leds.buf[0:3] = b'\x07\x07\x07'
+    leds.mark_dirty(0, 1)
+    leds.write()
+    assert leds._front[0:3] == b'\x07\x07\x07'
@@ -1,4 +0,0 @@
-from .trickLED import *
-
-version_info = (0, 2, 1)
-version = '.'.join([str(v) for v in version_info])
\ No newline at end of file
@@ -1,9 +1,10 @@
-from effects import get_effect_names, get_generator_names
+from effects import get_effect_names, get_generator_names, get_palette_names
 
 def web_page(colors, index):
     rgb=str(colors['rgb'])
     effect=colors['effect']
     generator=colors['generator']
+    palette=colors.get('palette') or 'none'
     effects_list = get_effect_names()
     generators_list = get_generator_names()
 
@@ -33,10 +34,20 @@ def web_page(colors, index):
         return "".join(['<option value="{}">{}</option>'.format(generator, generator) for generator in get_generator_names()])
 
     if index == 6:
+        return b'''</select>'''
+
+    # PALETTE SELECTOR
+    if index == 7:
+        return b'''<div><label for="palette">Select a palette</label><select id="palette" name="palette">'''
+
+    if index == 8:
+        return "".join(['<option value="{}">{}</option>'.format(palette, palette) for palette in get_palette_names()])
+
+    if index == 9:
         return b'''</select><button type="submit">POST</button></form>'''
 
     # JAVA SCRIPT
-    if index == 7:
+    if index == 10:
         return b'''<script>
             const rgbSelector = document.querySelector('#colorWell');
             const rgbOutput = document.querySelector('.colorOutput');
@@ -48,4 +59,5 @@ def web_page(colors, index):
             
             document.querySelector('#effect').value="{}";
             document.querySelector('#generator').value="{}";
-            </script></body></html>'''.format(effect, generator)
+            document.querySelector('#palette').value="{}";
+            </script></body></html>'''.format(effect, generator, palette)